@@ -185,6 +185,8 @@ class IQReader:
         Returns:
             Float32 numpy array of squared magnitudes.
         """
+        from .demodulator import iq_to_magnitude
+
         byte_offset = offset * 2
 
         if count is not None:
@@ -193,8 +195,7 @@ class IQReader:
             byte_count = self._file_size - byte_offset
 
         raw = np.fromfile(self.path, dtype=np.uint8, count=byte_count, offset=byte_offset)
-        iq = raw.reshape(-1, 2).astype(np.float32) - 127.5
-        return iq[:, 0] ** 2 + iq[:, 1] ** 2
+        return iq_to_magnitude(raw)
 
 
 class LiveDemodCapture:
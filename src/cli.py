@@ -129,6 +129,7 @@ def track(file: str | None, live: bool, db_path: str, ref_lat: float | None,
 
         last_print = 0.0
         last_prune = 0.0
+        last_flush = 0.0
         for raw_frame in frame_source:
             frame = parse_frame(raw_frame.hex_str, timestamp=raw_frame.timestamp)
             if frame:
@@ -136,7 +137,7 @@ def track(file: str | None, live: bool, db_path: str, ref_lat: float | None,
                 if msg:
                     ac = tracker.aircraft.get(msg.icao)
                     if ac:
-                        events = filter_engine.check(ac)
+                        events = filter_engine.check(ac, tracker.last_changed)
                         for event in events:
                             db.add_event(
                                 icao=event.icao,
@@ -157,6 +158,9 @@ def track(file: str | None, live: bool, db_path: str, ref_lat: float | None,
             if live:
                 import time as _time
                 now = _time.time()
+                if now - last_flush >= 1:
+                    tracker.flush()
+                    last_flush = now
                 if now - last_print > 10:
                     active = tracker.get_active()
                     console.print(
@@ -205,6 +209,8 @@ def track(file: str | None, live: bool, db_path: str, ref_lat: float | None,
                             if phantoms: parts.append(f"phantoms: {phantoms}")
                             console.print(f"  [dim]Cleaned {total_cleaned} rows ({', '.join(parts)})[/]")
                             db.vacuum()
+                        db.recount()
+                        db.optimize()
                         last_prune = now
 
     except KeyboardInterrupt:
@@ -212,6 +218,7 @@ def track(file: str | None, live: bool, db_path: str, ref_lat: float | None,
         if live and isinstance(frame_source, LiveCapture):
             frame_source.stop()
 
+    tracker.flush()
     db.flush()
     db.end_capture(
         cap_id,
@@ -6,12 +6,18 @@ database path, dashboard port, and webhook URL.
 
 from __future__ import annotations
 
+import copy
 import os
+from collections import OrderedDict
 from pathlib import Path
 
 CONFIG_DIR = Path.home() / ".adsb-decode"
 CONFIG_FILE = CONFIG_DIR / "config.yaml"
 
+# Parsed configs keyed by path, validated against (mtime_ns, size)
+_CACHE: OrderedDict[Path, tuple[int, int, dict]] = OrderedDict()
+_CACHE_MAX = 16
+
 
 def _parse_value(val: str):
     """Parse a YAML-like value string into a Python type."""
@@ -58,14 +64,33 @@ def load_config() -> dict:
     """Load config from ~/.adsb-decode/config.yaml.
 
     Returns default config if file doesn't exist.
-    Uses simple key=value parsing to avoid PyYAML dependency.
+    Uses simple key=value parsing to avoid PyYAML dependency. The parse is
+    cached until the file's mtime or size changes; callers get a deep copy
+    they are free to mutate.
     """
-    config = _default_config()
-    if not CONFIG_FILE.exists():
-        return config
+    path = CONFIG_FILE
+    try:
+        st = path.stat()
+    except OSError:
+        return _default_config()
+
+    cached = _CACHE.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        _CACHE.move_to_end(path)
+        return copy.deepcopy(cached[2])
+
+    config = _parse_config(path)
+    _CACHE[path] = (st.st_mtime_ns, st.st_size, copy.deepcopy(config))
+    if len(_CACHE) > _CACHE_MAX:
+        _CACHE.popitem(last=False)
+    return config
+
 
+def _parse_config(path: Path) -> dict:
+    """Parse a config file over the defaults."""
+    config = _default_config()
     try:
-        text = CONFIG_FILE.read_text()
+        text = path.read_text()
         # Simple YAML-like parser for our flat config
         current_section = None
         for line in text.splitlines():
@@ -140,4 +165,5 @@ def save_config(config: dict) -> Path:
                 lines.append(f"{section}: {values}")
 
     CONFIG_FILE.write_text("\n".join(lines) + "\n")
+    _CACHE.pop(CONFIG_FILE, None)
     return CONFIG_FILE
@@ -20,6 +20,9 @@ Edge cases: zone boundary crossings, polar regions (NL=1), antimeridian wrapping
 from __future__ import annotations
 
 import math
+from bisect import bisect_right
+
+import numpy as np
 
 NZ = 15  # Number of latitude zones per hemisphere
 NB = 17  # Bits per coordinate
@@ -29,18 +32,11 @@ CPR_MAX = 2**NB  # 131072
 MAX_PAIR_AGE = 10.0
 
 
-def _nl(lat: float) -> int:
-    """Number of longitude zones at a given latitude (NL function).
-
-    Returns the number of longitude zones for the given latitude.
-    This determines how many CPR longitude zones exist at that latitude.
-
-    Ranges from NL=1 near poles to NL=59 at equator.
-    """
+def _nl_formula(lat: float) -> int:
+    """NL computed directly from the ICAO Doc 9871 formula (slow path, used to build the table)."""
     if abs(lat) >= 87.0:
         return 1
 
-    # NL formula from ICAO Doc 9871
     nz = NZ
     a = 1 - math.cos(math.pi / (2 * nz))
     b = math.cos(math.pi / 180 * abs(lat)) ** 2
@@ -48,6 +44,37 @@ def _nl(lat: float) -> int:
     return max(nl, 1)
 
 
+def _build_nl_table() -> list[float]:
+    """Transition latitudes where NL drops by one, ascending.
+
+    Entry k is the latitude at which NL goes from 59 - k to 58 - k, so
+    NL(lat) == 59 - bisect_right(table, abs(lat)). The last entry is the
+    hard 87 degree polar cutoff.
+    """
+    a = 1 - math.cos(math.pi / (2 * NZ))
+    table = []
+    for nl in range(59, 2, -1):
+        table.append(math.degrees(math.acos(math.sqrt(a / (1 - math.cos(2 * math.pi / nl))))))
+    table.append(87.0)
+    return table
+
+
+_NL_TABLE = _build_nl_table()
+_NL_TABLE_NP = np.array(_NL_TABLE)
+
+
+def _nl(lat: float) -> int:
+    """Number of longitude zones at a given latitude (NL function).
+
+    Returns the number of longitude zones for the given latitude.
+    This determines how many CPR longitude zones exist at that latitude.
+
+    Ranges from NL=1 near poles to NL=59 at equator. Looked up by bisecting
+    the precomputed transition latitudes instead of evaluating acos/cos per call.
+    """
+    return 59 - bisect_right(_NL_TABLE, abs(lat))
+
+
 def _mod(x: float, y: float) -> float:
     """Modulo that always returns non-negative result."""
     return x - y * math.floor(x / y)
@@ -185,3 +212,50 @@ def local_decode(
         lon -= 360
 
     return (round(lat, 6), round(lon, 6))
+
+
+def global_decode_many(
+    lat_even: np.ndarray,
+    lon_even: np.ndarray,
+    lat_odd: np.ndarray,
+    lon_odd: np.ndarray,
+    t_even: np.ndarray,
+    t_odd: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized global_decode over arrays of even/odd frame pairs.
+
+    Intended for batch work (replaying captures, backfilling positions) where
+    calling global_decode per pair is the bottleneck.
+
+    Returns:
+        (latitudes, longitudes) as float arrays. Pairs that global_decode would
+        reject (stale pair, zone boundary crossing) are NaN.
+    """
+    t_even = np.asarray(t_even, dtype=np.float64)
+    t_odd = np.asarray(t_odd, dtype=np.float64)
+    lat_even_cpr = np.asarray(lat_even, dtype=np.float64) / CPR_MAX
+    lon_even_cpr = np.asarray(lon_even, dtype=np.float64) / CPR_MAX
+    lat_odd_cpr = np.asarray(lat_odd, dtype=np.float64) / CPR_MAX
+    lon_odd_cpr = np.asarray(lon_odd, dtype=np.float64) / CPR_MAX
+
+    j = np.floor(59 * lat_even_cpr - 60 * lat_odd_cpr + 0.5)
+    lat_e = (360.0 / (4 * NZ)) * (np.mod(j, 60) + lat_even_cpr)
+    lat_o = (360.0 / (4 * NZ - 1)) * (np.mod(j, 59) + lat_odd_cpr)
+    lat_e = np.where(lat_e >= 270, lat_e - 360, lat_e)
+    lat_o = np.where(lat_o >= 270, lat_o - 360, lat_o)
+
+    nl_e = 59 - np.searchsorted(_NL_TABLE_NP, np.abs(lat_e), side="right")
+    nl_o = 59 - np.searchsorted(_NL_TABLE_NP, np.abs(lat_o), side="right")
+
+    use_even = t_even >= t_odd
+    lat = np.where(use_even, lat_e, lat_o)
+    nl = np.where(use_even, nl_e, nl_o)
+    n_lon = np.maximum(np.where(use_even, nl, nl - 1), 1)
+    m = np.floor(lon_even_cpr * (nl - 1) - lon_odd_cpr * nl + 0.5)
+    lon = (360.0 / n_lon) * (np.mod(m, n_lon) + np.where(use_even, lon_even_cpr, lon_odd_cpr))
+    lon = np.where(lon >= 180, lon - 360, lon)
+
+    bad = (np.abs(t_even - t_odd) > MAX_PAIR_AGE) | (nl_e != nl_o)
+    lat = np.where(bad, np.nan, np.round(lat, 6))
+    lon = np.where(bad, np.nan, np.round(lon, 6))
+    return lat, lon
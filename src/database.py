@@ -8,6 +8,11 @@ Schema:
 - captures:   Metadata per capture session. Source file, duration, frame counts. Tagged with receiver_id.
 - events:     Detected anomalies. Emergency squawk, rapid descent, military, geofence breach.
 
+A row_counts table, kept current by insert/delete triggers, backs stats() so the
+dashboard never runs COUNT(*) over the large tables; recount() repairs any drift.
+A data_versions table, bumped by triggers on every aircraft write, gives the
+dashboard a cheap change marker.
+
 Every position and capture records which receiver heard it. Single-receiver deployments
 have one row in receivers. Adding receivers is adding data sources, not refactoring.
 """
@@ -16,6 +21,7 @@ from __future__ import annotations
 
 import sqlite3
 import time
+from contextlib import contextmanager
 from pathlib import Path
 
 SCHEMA = """
@@ -35,7 +41,8 @@ CREATE TABLE IF NOT EXISTS aircraft (
     country TEXT,
     is_military INTEGER DEFAULT 0,
     first_seen REAL NOT NULL,
-    last_seen REAL NOT NULL
+    last_seen REAL NOT NULL,
+    last_position_id INTEGER
 );
 
 CREATE TABLE IF NOT EXISTS sightings (
@@ -88,6 +95,7 @@ CREATE TABLE IF NOT EXISTS events (
 );
 
 CREATE INDEX IF NOT EXISTS idx_positions_icao ON positions(icao);
+CREATE INDEX IF NOT EXISTS idx_positions_icao_ts ON positions(icao, timestamp);
 CREATE INDEX IF NOT EXISTS idx_positions_timestamp ON positions(timestamp);
 CREATE INDEX IF NOT EXISTS idx_positions_receiver ON positions(receiver_id);
 CREATE INDEX IF NOT EXISTS idx_sightings_icao ON sightings(icao);
@@ -97,33 +105,241 @@ CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type);
 CREATE INDEX IF NOT EXISTS idx_aircraft_last_seen ON aircraft(last_seen);
 """
 
+# Hot-path statements, hit once or more per decoded frame. Kept as module
+# constants so every call hands sqlite3 the same string for its statement cache.
+SQL_UPSERT_AIRCRAFT = """INSERT INTO aircraft (icao, country, registration, is_military, first_seen, last_seen)
+   VALUES (?, ?, ?, ?, ?, ?)
+   ON CONFLICT(icao) DO UPDATE SET
+       country = COALESCE(excluded.country, country),
+       registration = COALESCE(excluded.registration, registration),
+       is_military = MAX(is_military, excluded.is_military),
+       last_seen = MAX(last_seen, excluded.last_seen)"""
+
+SQL_TOUCH_AIRCRAFT = "UPDATE aircraft SET last_seen = MAX(last_seen, ?) WHERE icao = ?"
+
+SQL_INSERT_POSITION = """INSERT INTO positions
+   (icao, receiver_id, lat, lon, altitude_ft, speed_kts, heading_deg, vertical_rate_fpm, timestamp)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+SQL_INSERT_EVENT = """INSERT INTO events (icao, event_type, description, lat, lon, altitude_ft, timestamp)
+   VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+SQL_SELECT_SIGHTING = (
+    "SELECT id, min_altitude_ft, max_altitude_ft, message_count FROM sightings "
+    "WHERE icao = ? AND capture_id IS ?"
+)
+
+SQL_UPDATE_SIGHTING = """UPDATE sightings SET
+       callsign = COALESCE(?, callsign),
+       squawk = COALESCE(?, squawk),
+       min_altitude_ft = ?,
+       max_altitude_ft = ?,
+       message_count = message_count + 1,
+       last_seen = ?
+   WHERE id = ?"""
+
+SQL_INSERT_SIGHTING = """INSERT INTO sightings
+   (icao, capture_id, callsign, squawk, min_altitude_ft, max_altitude_ft, message_count, first_seen, last_seen)
+   VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)"""
+
+# Per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Memory-map up to 256 MB of the database file for reads
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Page cache per connection, in KiB (SQLite default is 2 MB)
+PAGE_CACHE_KB = 64 * 1024
+
+# Tables whose row counts are maintained incrementally for stats().
+COUNTED_TABLES = ("aircraft", "positions", "events", "receivers", "captures")
+
+
+def _row_counts_schema() -> str:
+    """Counter table plus insert/delete triggers for each counted table.
+
+    Seeding only runs when a table has no counter row yet, so an existing
+    database pays one COUNT(*) per table once. Applied by install_counters().
+    """
+    parts = [
+        (
+            "CREATE TABLE IF NOT EXISTS row_counts ("
+            "name TEXT PRIMARY KEY, cnt INTEGER NOT NULL DEFAULT 0);"
+        )
+    ]
+    for table in COUNTED_TABLES:
+        parts.append(f"""
+INSERT INTO row_counts (name, cnt)
+    SELECT '{table}', (SELECT COUNT(*) FROM {table})
+    WHERE NOT EXISTS (SELECT 1 FROM row_counts WHERE name = '{table}');
+CREATE TRIGGER IF NOT EXISTS trg_{table}_count_ins AFTER INSERT ON {table}
+BEGIN UPDATE row_counts SET cnt = cnt + 1 WHERE name = '{table}'; END;
+CREATE TRIGGER IF NOT EXISTS trg_{table}_count_del AFTER DELETE ON {table}
+BEGIN UPDATE row_counts SET cnt = cnt - 1 WHERE name = '{table}'; END;""")
+    return "\n".join(parts)
+
+
+ROW_COUNTS_SCHEMA = _row_counts_schema()
+
+
+# aircraft.last_position_id always names the newest positions row for that
+# ICAO, so "latest position per aircraft" is a primary-key join.
+LAST_POSITION_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_positions_last_id AFTER INSERT ON positions
+BEGIN UPDATE aircraft SET last_position_id = NEW.id WHERE icao = NEW.icao; END;
+"""
+
+# data_versions.version for 'aircraft' moves on every insert, delete, or update
+# that changes a column. Writes with an older last_seen (lagging feeders, file
+# replays) still bump it, so it is a safe ETag where MAX(last_seen) is not.
+AIRCRAFT_VERSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS data_versions (
+    name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_versions (name, version) VALUES ('aircraft', 0);
+CREATE TRIGGER IF NOT EXISTS trg_aircraft_version_ins AFTER INSERT ON aircraft
+BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'aircraft'; END;
+CREATE TRIGGER IF NOT EXISTS trg_aircraft_version_del AFTER DELETE ON aircraft
+BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'aircraft'; END;
+CREATE TRIGGER IF NOT EXISTS trg_aircraft_version_upd AFTER UPDATE ON aircraft
+WHEN OLD.last_seen IS NOT NEW.last_seen
+  OR OLD.first_seen IS NOT NEW.first_seen
+  OR OLD.registration IS NOT NEW.registration
+  OR OLD.country IS NOT NEW.country
+  OR OLD.is_military IS NOT NEW.is_military
+  OR OLD.last_position_id IS NOT NEW.last_position_id
+BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'aircraft'; END;
+"""
+
+
+# Everything install_counters() creates; when all of it exists there is nothing to do
+COUNTER_OBJECTS = frozenset(
+    {"row_counts", "data_versions",
+     "trg_aircraft_version_ins", "trg_aircraft_version_del", "trg_aircraft_version_upd"}
+    | {f"trg_{table}_count_{op}" for table in COUNTED_TABLES for op in ("ins", "del")}
+)
+
+
+def install_counters(conn: sqlite3.Connection):
+    """Seed row_counts/data_versions and create their triggers atomically.
+
+    Only runs for a new database or one from before the counters existed, so
+    opening an up-to-date database never takes the write lock. BEGIN IMMEDIATE
+    holds that lock from the seed COUNT(*) until the triggers exist, so no
+    writer can commit a row that neither the seed nor a trigger counts.
+    """
+    present = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+        )
+    }
+    if COUNTER_OBJECTS <= present:
+        return
+    try:
+        conn.executescript(f"BEGIN IMMEDIATE;{ROW_COUNTS_SCHEMA}{AIRCRAFT_VERSION_SCHEMA}COMMIT;")
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+def migrate_schema(conn: sqlite3.Connection):
+    """Add columns introduced after a database was first created.
+
+    CREATE TABLE IF NOT EXISTS leaves existing tables alone, so new columns
+    are added here and backfilled once.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(aircraft)")}
+    if "last_position_id" not in columns:
+        conn.execute("ALTER TABLE aircraft ADD COLUMN last_position_id INTEGER")
+        conn.execute(
+            "UPDATE aircraft SET last_position_id = "
+            "(SELECT MAX(id) FROM positions WHERE icao = aircraft.icao)"
+        )
+        conn.commit()
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """Apply the read/write tuning PRAGMAs once per connection.
+
+    WAL lets the dashboard read while ingest writes. WAL + NORMAL only fsyncs
+    at checkpoints; a crash can lose the last few commits but never corrupts
+    the database.
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{PAGE_CACHE_KB}")
+    conn.execute("PRAGMA foreign_keys=ON")
+
 
 class Database:
     """SQLite database for ADS-B aircraft tracking data."""
 
-    def __init__(self, path: str | Path = ":memory:", autocommit: bool = True):
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        autocommit: bool = True,
+        check_same_thread: bool = True,
+    ):
         self.path = str(path)
         self._conn: sqlite3.Connection | None = None
         self._autocommit = autocommit
+        self._check_same_thread = check_same_thread
         self._pending = 0
+        self._in_transaction = False
 
     @property
     def conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            self._conn = sqlite3.connect(self.path)
+            self._conn = sqlite3.connect(
+                self.path,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                check_same_thread=self._check_same_thread,
+            )
             self._conn.row_factory = sqlite3.Row
-            self._conn.execute("PRAGMA journal_mode=WAL")
-            self._conn.execute("PRAGMA foreign_keys=ON")
+            configure_connection(self._conn)
             self._conn.executescript(SCHEMA)
+            migrate_schema(self._conn)
+            self._conn.executescript(LAST_POSITION_TRIGGER)
+            install_counters(self._conn)
         return self._conn
 
     def _maybe_commit(self):
         """Commit immediately if autocommit, otherwise batch."""
         self._pending += 1
-        if self._autocommit:
+        if self._autocommit and not self._in_transaction:
             self.conn.commit()
             self._pending = 0
 
+    @contextmanager
+    def transaction(self):
+        """Run a group of writes as one BEGIN … COMMIT.
+
+        Per-call autocommits are held back until the block exits, so the
+        writes cost a single commit (and fsync). Rolls back on error.
+        Nested blocks join the outer transaction.
+        """
+        if self._in_transaction:
+            yield self
+            return
+        conn = self.conn
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        self._in_transaction = True
+        try:
+            yield self
+        except BaseException:
+            conn.rollback()
+            self._pending = 0
+            raise
+        else:
+            conn.commit()
+            self._pending = 0
+        finally:
+            self._in_transaction = False
+
     def flush(self):
         """Commit any pending writes."""
         if self._conn and self._pending > 0:
@@ -133,6 +349,7 @@ class Database:
     def close(self):
         if self._conn:
             self.flush()
+            self.optimize()
             self._conn.close()
             self._conn = None
 
@@ -180,17 +397,26 @@ class Database:
         """Insert or update aircraft record."""
         ts = timestamp or time.time()
         self.conn.execute(
-            """INSERT INTO aircraft (icao, country, registration, is_military, first_seen, last_seen)
-               VALUES (?, ?, ?, ?, ?, ?)
-               ON CONFLICT(icao) DO UPDATE SET
-                   country = COALESCE(excluded.country, country),
-                   registration = COALESCE(excluded.registration, registration),
-                   is_military = MAX(is_military, excluded.is_military),
-                   last_seen = MAX(last_seen, excluded.last_seen)""",
+            SQL_UPSERT_AIRCRAFT,
             (icao, country, registration, int(is_military), ts, ts),
         )
         self._maybe_commit()
 
+    def touch_aircraft(self, last_seen: dict[str, float]):
+        """Advance last_seen for many aircraft in one executemany.
+
+        Args:
+            last_seen: {icao: timestamp}. Timestamps older than the stored
+                value are ignored.
+        """
+        if not last_seen:
+            return
+        self.conn.executemany(
+            SQL_TOUCH_AIRCRAFT,
+            [(ts, icao) for icao, ts in last_seen.items()],
+        )
+        self._maybe_commit()
+
     def get_aircraft(self, icao: str) -> dict | None:
         row = self.conn.execute(
             "SELECT * FROM aircraft WHERE icao = ?", (icao,)
@@ -218,13 +444,32 @@ class Database:
         """Record a position report."""
         ts = timestamp or time.time()
         self.conn.execute(
-            """INSERT INTO positions
-               (icao, receiver_id, lat, lon, altitude_ft, speed_kts, heading_deg, vertical_rate_fpm, timestamp)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            SQL_INSERT_POSITION,
             (icao, receiver_id, lat, lon, altitude_ft, speed_kts, heading_deg, vertical_rate_fpm, ts),
         )
         self._maybe_commit()
 
+    def add_positions(self, rows: list[tuple]):
+        """Record many position reports in one executemany.
+
+        Args:
+            rows: Tuples in add_position's argument order (icao, lat, lon,
+                altitude_ft, speed_kts, heading_deg, vertical_rate_fpm,
+                receiver_id, timestamp). Trailing fields may be omitted and
+                take add_position's defaults.
+        """
+        now = time.time()
+        params = []
+        for row in rows:
+            icao, lat, lon, alt, speed, heading, vrate, receiver_id, ts = (
+                *row, *(None,) * (9 - len(row))
+            )
+            params.append((icao, receiver_id, lat, lon, alt, speed, heading, vrate, ts or now))
+        if not params:
+            return
+        self.conn.executemany(SQL_INSERT_POSITION, params)
+        self._maybe_commit()
+
     def get_positions(self, icao: str, limit: int = 100) -> list[dict]:
         rows = self.conn.execute(
             "SELECT * FROM positions WHERE icao = ? ORDER BY timestamp DESC LIMIT ?",
@@ -282,8 +527,7 @@ class Database:
         """Record a detected event/anomaly."""
         ts = timestamp or time.time()
         self.conn.execute(
-            """INSERT INTO events (icao, event_type, description, lat, lon, altitude_ft, timestamp)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            SQL_INSERT_EVENT,
             (icao, event_type, description, lat, lon, altitude_ft, ts),
         )
         self._maybe_commit()
@@ -328,10 +572,7 @@ class Database:
         """Update or create a sighting for the current capture session."""
         ts = timestamp or time.time()
         # Try to find existing sighting for this icao + capture
-        row = self.conn.execute(
-            "SELECT id, min_altitude_ft, max_altitude_ft, message_count FROM sightings WHERE icao = ? AND capture_id IS ?",
-            (icao, capture_id),
-        ).fetchone()
+        row = self.conn.execute(SQL_SELECT_SIGHTING, (icao, capture_id)).fetchone()
 
         if row:
             min_alt = row["min_altitude_ft"]
@@ -340,25 +581,22 @@ class Database:
                 min_alt = min(min_alt, altitude_ft) if min_alt is not None else altitude_ft
                 max_alt = max(max_alt, altitude_ft) if max_alt is not None else altitude_ft
             self.conn.execute(
-                """UPDATE sightings SET
-                       callsign = COALESCE(?, callsign),
-                       squawk = COALESCE(?, squawk),
-                       min_altitude_ft = ?,
-                       max_altitude_ft = ?,
-                       message_count = message_count + 1,
-                       last_seen = ?
-                   WHERE id = ?""",
+                SQL_UPDATE_SIGHTING,
                 (callsign, squawk, min_alt, max_alt, ts, row["id"]),
             )
         else:
             self.conn.execute(
-                """INSERT INTO sightings
-                   (icao, capture_id, callsign, squawk, min_altitude_ft, max_altitude_ft, message_count, first_seen, last_seen)
-                   VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)""",
+                SQL_INSERT_SIGHTING,
                 (icao, capture_id, callsign, squawk, altitude_ft, altitude_ft, ts, ts),
             )
         self._maybe_commit()
 
+    def get_sightings(self, icao: str) -> list[dict]:
+        rows = self.conn.execute(
+            "SELECT * FROM sightings WHERE icao = ? ORDER BY id", (icao,)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
     # --- Maintenance ---
 
     def prune_positions(self, max_age_hours: int = 168) -> int:
@@ -449,14 +687,39 @@ class Database:
         self.conn.execute("VACUUM")
         self.conn.commit()
 
+    def optimize(self):
+        """Refresh planner statistics for indexes the session leaned on.
+
+        PRAGMA optimize only re-analyzes tables whose statistics look stale,
+        so it is cheap enough to run on close and after periodic pruning.
+        """
+        self.conn.execute("PRAGMA optimize")
+
+    def recount(self) -> dict:
+        """Rebuild row_counts from COUNT(*) and return the corrected stats().
+
+        Repairs counter drift, e.g. from rows written while the triggers were
+        missing. Costs one COUNT(*) per counted table, so it belongs with the
+        periodic prune, not on every open.
+        """
+        with self.transaction():
+            for table in COUNTED_TABLES:
+                self.conn.execute(
+                    f"""INSERT INTO row_counts (name, cnt)
+                        VALUES ('{table}', (SELECT COUNT(*) FROM {table}))
+                        ON CONFLICT(name) DO UPDATE SET cnt = excluded.cnt"""
+                )
+        return self.stats()
+
     # --- Stats ---
 
     def stats(self) -> dict:
-        """Return summary statistics."""
-        return {
-            "aircraft": self.count_aircraft(),
-            "positions": self.count_positions(),
-            "events": self.count_events(),
-            "receivers": self.conn.execute("SELECT COUNT(*) as cnt FROM receivers").fetchone()["cnt"],
-            "captures": self.conn.execute("SELECT COUNT(*) as cnt FROM captures").fetchone()["cnt"],
-        }
+        """Return summary statistics.
+
+        Reads the trigger-maintained row_counts table, so this is O(1)
+        regardless of table size.
+        """
+        counts = dict.fromkeys(COUNTED_TABLES, 0)
+        for row in self.conn.execute("SELECT name, cnt FROM row_counts"):
+            counts[row["name"]] = row["cnt"]
+        return counts
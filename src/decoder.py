@@ -28,7 +28,7 @@ _CHARSET = "#ABCDEFGHIJKLMNOPQRSTUVWXYZ##### ###############0123456789######"
 # --- Message dataclasses ---
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IdentificationMsg:
     """TC 1-4: Aircraft identification (callsign)."""
 
@@ -38,7 +38,7 @@ class IdentificationMsg:
     timestamp: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PositionMsg:
     """TC 5-8 (surface) or TC 9-18/20-22 (airborne): CPR-encoded position."""
 
@@ -52,7 +52,7 @@ class PositionMsg:
     is_surface: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VelocityMsg:
     """TC 19: Airborne velocity."""
 
@@ -64,7 +64,7 @@ class VelocityMsg:
     timestamp: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AltitudeMsg:
     """DF0/4/16/20: Altitude reply."""
 
@@ -73,7 +73,7 @@ class AltitudeMsg:
     timestamp: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SquawkMsg:
     """DF5/21: Identity reply (squawk code)."""
 
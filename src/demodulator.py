@@ -82,6 +82,10 @@ def _build_mag_lut() -> np.ndarray:
 
 _MAG_LUT = _build_mag_lut()
 
+# Flat view indexed by a little-endian uint16 read of one (I, Q) byte pair,
+# i.e. Q*256 + I -> lut[Q][I], which equals lut[I][Q] since the table is symmetric
+_MAG_LUT_FLAT = _MAG_LUT.ravel()
+
 
 def iq_to_magnitude(raw: np.ndarray) -> np.ndarray:
     """Convert interleaved uint8 IQ pairs to squared magnitude.
@@ -95,8 +99,9 @@ def iq_to_magnitude(raw: np.ndarray) -> np.ndarray:
     Returns:
         Float32 array of squared magnitudes, one per sample.
     """
-    iq = raw.reshape(-1, 2)
-    return _MAG_LUT[iq[:, 0], iq[:, 1]]
+    # One 1-D gather per sample instead of two index arrays into the 2-D table
+    pairs = np.ascontiguousarray(raw).view("<u2")
+    return np.take(_MAG_LUT_FLAT, pairs)
 
 
 # --- Phase 8: Adaptive Signal Threshold ---
@@ -242,32 +247,24 @@ def recover_bits(
     Returns:
         List of 0/1 integers, or (bits, uncertain_count) if track_confidence=True.
     """
-    bits = []
-    uncertain_count = 0
-    prev_bit = 0
-
-    for i in range(n_bits):
-        sample_pos = pos + i * SAMPLES_PER_BIT
-        if sample_pos + 1 >= len(mag):
-            break
-
-        high = float(mag[sample_pos])
-        low = float(mag[sample_pos + 1])
-        signal = max(high, low)
-
-        if signal > 0 and abs(high - low) / signal < BIT_DELTA_THRESHOLD:
-            # Weak transition — use previous bit value (continuity)
-            bits.append(prev_bit)
-            uncertain_count += 1
-        elif high > low:
-            bits.append(1)
-        else:
-            bits.append(0)
-
-        prev_bit = bits[-1]
+    n = max(0, min(n_bits, (len(mag) - pos) // SAMPLES_PER_BIT))
+    window = np.asarray(mag[pos:pos + n * SAMPLES_PER_BIT], dtype=np.float64)
+    high = window[0::SAMPLES_PER_BIT]
+    low = window[1::SAMPLES_PER_BIT]
+    signal = np.maximum(high, low)
+
+    positive = signal > 0
+    uncertain = positive & (np.abs(high - low) / np.where(positive, signal, 1.0) < BIT_DELTA_THRESHOLD)
+    decided = high > low
+
+    # Weak transition — carry the last confident bit forward (continuity);
+    # a leading run of weak bits falls back to 0
+    idx = np.where(uncertain, -1, np.arange(n))
+    np.maximum.accumulate(idx, out=idx)
+    bits = np.where(idx >= 0, decided[idx], False).astype(np.uint8).tolist()
 
     if track_confidence:
-        return bits, uncertain_count
+        return bits, int(uncertain.sum())
     return bits
 
 
@@ -26,24 +26,20 @@ def export_csv(db: Database, path: str | Path | None = None) -> str:
     Columns: icao, lat, lon, altitude_ft, speed_kts, heading_deg,
              vertical_rate_fpm, timestamp, receiver_id
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
+    columns = [
         "icao", "lat", "lon", "altitude_ft", "speed_kts",
         "heading_deg", "vertical_rate_fpm", "timestamp", "receiver_id",
-    ])
-
-    # Get all aircraft, then their positions
-    rows = db.conn.execute(
-        "SELECT * FROM positions ORDER BY timestamp DESC"
-    ).fetchall()
-
-    for row in rows:
-        writer.writerow([
-            row["icao"], row["lat"], row["lon"], row["altitude_ft"],
-            row["speed_kts"], row["heading_deg"], row["vertical_rate_fpm"],
-            row["timestamp"], row["receiver_id"],
-        ])
+    ]
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(columns)
+
+    # Plain tuples in column order straight into writerows — no per-row
+    # sqlite3.Row or list rebuild
+    cursor = db.conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(f"SELECT {', '.join(columns)} FROM positions ORDER BY timestamp DESC")
+    writer.writerows(cursor)
 
     text = output.getvalue()
     if path:
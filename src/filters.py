@@ -15,7 +15,15 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass, field
 
-from .tracker import AircraftState
+from .tracker import (
+    CHANGED_ALL,
+    CHANGED_ALT,
+    CHANGED_ID,
+    CHANGED_POS,
+    CHANGED_SQUAWK,
+    CHANGED_VEL,
+    AircraftState,
+)
 
 
 # --- Event types ---
@@ -107,18 +115,33 @@ class FilterEngine:
         # Track emitted events to avoid duplicates: {(icao, event_type)}
         self._emitted: set[tuple[str, str]] = set()
 
-    def check(self, ac: AircraftState) -> list[Event]:
-        """Run all filters against an aircraft state. Returns new events."""
+    def check(self, ac: AircraftState, changed: int = CHANGED_ALL) -> list[Event]:
+        """Run filters against an aircraft state. Returns new events.
+
+        Args:
+            ac: Aircraft to check.
+            changed: CHANGED_* bits for what the last update touched
+                (Tracker.last_changed). Filters whose inputs are not in the
+                mask are skipped. Defaults to running everything.
+        """
         events: list[Event] = []
 
-        events.extend(self._check_military(ac))
-        events.extend(self._check_emergency(ac))
-        events.extend(self._check_rapid_descent(ac))
-        events.extend(self._check_low_altitude(ac))
-        events.extend(self._check_geofences(ac))
-        events.extend(self._check_circling(ac))
-        events.extend(self._check_holding(ac))
-        events.extend(self._check_unusual_altitude(ac))
+        if changed & CHANGED_ID:
+            events.extend(self._check_military(ac))
+        if changed & CHANGED_SQUAWK:
+            events.extend(self._check_emergency(ac))
+        if changed & CHANGED_VEL:
+            events.extend(self._check_rapid_descent(ac))
+        if changed & CHANGED_ALT:
+            events.extend(self._check_low_altitude(ac))
+        if changed & CHANGED_POS:
+            events.extend(self._check_geofences(ac))
+        if changed & CHANGED_VEL:
+            events.extend(self._check_circling(ac))
+        if changed & (CHANGED_POS | CHANGED_VEL):
+            events.extend(self._check_holding(ac))
+        if changed & (CHANGED_POS | CHANGED_VEL | CHANGED_ALT):
+            events.extend(self._check_unusual_altitude(ac))
 
         return events
 
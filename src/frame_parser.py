@@ -86,7 +86,7 @@ def reset_icao_cache() -> None:
     _icao_cache = IcaoCache()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ModeFrame:
     """A parsed Mode S frame."""
 
@@ -183,9 +183,9 @@ def parse_frame(
 
         # Attempt error correction for DF17/18 if CRC fails
         if not crc_ok and df in (17, 18):
-            fixed_hex = crc.try_fix(hex_str)
-            if fixed_hex is not None:
-                raw = bytes.fromhex(fixed_hex)
+            fixed = crc.try_fix_bytes(raw, crc_remainder)
+            if fixed is not None:
+                raw = fixed
                 # Re-extract ICAO (should be same for DF17/18)
                 icao = f"{raw[1]:02X}{raw[2]:02X}{raw[3]:02X}"
                 crc_ok = True
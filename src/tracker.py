@@ -15,6 +15,7 @@ Aircraft are considered stale after 60 seconds of no messages.
 from __future__ import annotations
 
 import time
+from collections import deque
 from dataclasses import dataclass, field
 
 from . import cpr, icao
@@ -33,8 +34,20 @@ from .frame_parser import ModeFrame
 # Aircraft considered stale after this many seconds of silence
 STALE_TIMEOUT = 60.0
 
+# Entries kept in each per-aircraft history buffer
+MAX_HISTORY = 120
 
-@dataclass
+# Bitmask of what a message touched (Tracker.last_changed), so FilterEngine
+# can skip filters whose inputs did not move
+CHANGED_ID = 1
+CHANGED_POS = 2
+CHANGED_VEL = 4
+CHANGED_ALT = 8
+CHANGED_SQUAWK = 16
+CHANGED_ALL = CHANGED_ID | CHANGED_POS | CHANGED_VEL | CHANGED_ALT | CHANGED_SQUAWK
+
+
+@dataclass(slots=True)
 class AircraftState:
     """Mutable state for a single tracked aircraft."""
 
@@ -68,12 +81,14 @@ class AircraftState:
     last_seen: float = 0.0
     message_count: int = 0
 
-    # History buffers for pattern detection
-    heading_history: list = field(default_factory=list)  # [(timestamp, heading_deg)]
-    position_history: list = field(default_factory=list)  # [(timestamp, lat, lon, alt)]
-
-    # Max history entries to keep (rolling buffer)
-    _MAX_HISTORY: int = field(default=120, repr=False)
+    # Rolling history buffers for pattern detection; the deque drops the
+    # oldest entry on append once full instead of re-slicing a list
+    heading_history: deque = field(
+        default_factory=lambda: deque(maxlen=MAX_HISTORY)
+    )  # [(timestamp, heading_deg)]
+    position_history: deque = field(
+        default_factory=lambda: deque(maxlen=MAX_HISTORY)
+    )  # [(timestamp, lat, lon, alt)]
 
     @property
     def has_position(self) -> bool:
@@ -128,6 +143,12 @@ class Tracker:
         # Last stored position timestamp per ICAO (for downsampling)
         self._last_stored: dict[str, float] = {}
 
+        # last_seen updates not yet written to the DB (see flush)
+        self._dirty_last_seen: dict[str, float] = {}
+
+        # What the most recent update() touched (CHANGED_* bits)
+        self.last_changed = 0
+
         # Counters
         self.total_frames = 0
         self.valid_frames = 0
@@ -136,7 +157,8 @@ class Tracker:
 
     def _get_or_create(self, icao_addr: str, timestamp: float) -> AircraftState:
         """Get existing aircraft state or create new one."""
-        if icao_addr not in self.aircraft:
+        state = self.aircraft.get(icao_addr)
+        if state is None:
             country = icao.lookup_country(icao_addr)
             registration = icao.icao_to_n_number(icao_addr)
             military = icao.is_military(icao_addr)
@@ -160,7 +182,7 @@ class Tracker:
                     is_military=military,
                     timestamp=timestamp,
                 )
-        return self.aircraft[icao_addr]
+        return state
 
     def update(self, frame: ModeFrame) -> DecodedMsg | None:
         """Process a single parsed frame through the tracker.
@@ -168,9 +190,11 @@ class Tracker:
         Decodes the frame, updates aircraft state, attempts CPR position
         resolve, and persists to database if configured.
 
-        Returns the decoded message, or None if decode failed.
+        Returns the decoded message, or None if decode failed. The fields
+        it touched are left in last_changed as CHANGED_* bits.
         """
         self.total_frames += 1
+        self.last_changed = 0
 
         msg = decode(frame)
         if msg is None:
@@ -178,6 +202,8 @@ class Tracker:
 
         self.valid_frames += 1
         ac = self._get_or_create(msg.icao, frame.timestamp)
+        # First message for this aircraft: every filter gets a look
+        changed = CHANGED_ALL if ac.message_count == 0 else 0
         ac.last_seen = frame.timestamp
         ac.message_count += 1
 
@@ -187,20 +213,26 @@ class Tracker:
 
         if isinstance(msg, IdentificationMsg):
             self._handle_identification(ac, msg)
+            changed |= CHANGED_ID
         elif isinstance(msg, PositionMsg):
             self._handle_position(ac, msg)
+            changed |= CHANGED_POS | CHANGED_ALT
         elif isinstance(msg, VelocityMsg):
             self._handle_velocity(ac, msg)
+            changed |= CHANGED_VEL
         elif isinstance(msg, AltitudeMsg):
             self._handle_altitude(ac, msg)
+            changed |= CHANGED_ALT
         elif isinstance(msg, SquawkMsg):
             self._handle_squawk(ac, msg)
+            changed |= CHANGED_SQUAWK
+        self.last_changed = changed
 
-        # Update sighting in DB
+        # Update sighting in DB; aircraft.last_seen is deferred to flush()
         if self.db:
-            self.db.upsert_aircraft(
-                ac.icao, timestamp=frame.timestamp
-            )
+            prev = self._dirty_last_seen.get(ac.icao)
+            if prev is None or frame.timestamp > prev:
+                self._dirty_last_seen[ac.icao] = frame.timestamp
             self.db.upsert_sighting(
                 icao=ac.icao,
                 capture_id=self.capture_id,
@@ -212,6 +244,16 @@ class Tracker:
 
         return msg
 
+    def flush(self):
+        """Write deferred aircraft.last_seen updates in one batch.
+
+        Call periodically (the CLI does every second) and at the end of each
+        ingest batch, instead of touching the aircraft row on every frame.
+        """
+        if self.db and self._dirty_last_seen:
+            self.db.touch_aircraft(self._dirty_last_seen)
+        self._dirty_last_seen = {}
+
     def _handle_identification(self, ac: AircraftState, msg: IdentificationMsg):
         ac.callsign = msg.callsign.strip() or ac.callsign
         # Re-check military status with callsign
@@ -240,8 +282,6 @@ class Tracker:
 
             # Record position for pattern detection (always, regardless of downsampling)
             ac.position_history.append((msg.timestamp, ac.lat, ac.lon, ac.altitude_ft))
-            if len(ac.position_history) > ac._MAX_HISTORY:
-                ac.position_history = ac.position_history[-ac._MAX_HISTORY:]
 
             if self.db:
                 # Downsample: skip DB write if we stored one for this ICAO recently
@@ -313,8 +353,6 @@ class Tracker:
             ac.heading_deg = msg.heading_deg
             # Record heading for circling detection
             ac.heading_history.append((msg.timestamp, msg.heading_deg))
-            if len(ac.heading_history) > ac._MAX_HISTORY:
-                ac.heading_history = ac.heading_history[-ac._MAX_HISTORY:]
         if msg.vertical_rate_fpm is not None:
             ac.vertical_rate_fpm = msg.vertical_rate_fpm
 
@@ -327,15 +365,18 @@ class Tracker:
 
     def get_active(self) -> list[AircraftState]:
         """Return all non-stale aircraft, sorted by last seen."""
+        # Same test as AircraftState.is_stale, with one clock read per call
+        cutoff = time.time() - STALE_TIMEOUT
         return sorted(
-            (ac for ac in self.aircraft.values() if not ac.is_stale),
+            (ac for ac in self.aircraft.values() if ac.last_seen and ac.last_seen >= cutoff),
             key=lambda ac: ac.last_seen,
             reverse=True,
         )
 
     def prune_stale(self) -> int:
         """Remove stale aircraft from tracking. Returns count removed."""
-        stale = [k for k, v in self.aircraft.items() if v.is_stale]
+        cutoff = time.time() - STALE_TIMEOUT
+        stale = [k for k, v in self.aircraft.items() if not v.last_seen or v.last_seen < cutoff]
         for k in stale:
             del self.aircraft[k]
         return len(stale)
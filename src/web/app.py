@@ -4,17 +4,68 @@ Creates app with:
 - REST API routes under /api/ (JSON endpoints for aircraft, positions, events)
 - Page routes for map, table, detail, stats views
 - CORS headers for local development
+- orjson serialization when installed (pip install adsb-decode[web])
+- br/gzip compression of large JSON responses when flask-compress is installed
 - Dark theme (avionics tradition)
 """
 
 from __future__ import annotations
 
+import atexit
+import queue
+
 from flask import Flask
 
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None  # type: ignore[assignment,misc]
+
 from ..database import Database
 from .ingest import ingest
+from .json_provider import OrjsonProvider, orjson
 from .routes import register_routes
 
+# Idle Database handles kept per app for reuse across requests
+DB_POOL_SIZE = 8
+
+
+class DatabasePool:
+    """Bounded LIFO pool of Database handles shared by request threads.
+
+    The threaded dev server starts a thread per request, so per-thread handles
+    would never be reused. Each handle serves one request at a time, which
+    makes relaxing sqlite3's same-thread check safe. Handles released into a
+    full pool are closed; close() shuts down the idle ones.
+    """
+
+    def __init__(self, path: str, size: int = DB_POOL_SIZE):
+        self.path = path
+        self._idle: queue.LifoQueue[Database] = queue.LifoQueue(maxsize=size)
+
+    def acquire(self) -> Database:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return Database(self.path, check_same_thread=False)
+
+    def release(self, db: Database):
+        # Don't leak a half-done transaction into the next request
+        if db.conn.in_transaction:
+            db.conn.rollback()
+        try:
+            self._idle.put_nowait(db)
+        except queue.Full:
+            db.close()
+
+    def close(self):
+        while True:
+            try:
+                db = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            db.close()
+
 
 def create_app(db_path: str = "data/adsb.db", tracker=None) -> Flask:
     """Create and configure the Flask application."""
@@ -28,22 +79,44 @@ def create_app(db_path: str = "data/adsb.db", tracker=None) -> Flask:
     app.config["DB_PATH"] = db_path
     app.config["TEMPLATES_AUTO_RELOAD"] = True
 
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    # Compact, insertion-ordered output even under --debug. Flask 3 dropped
+    # JSONIFY_PRETTYPRINT_REGULAR / JSON_SORT_KEYS for these provider attributes.
+    app.json.compact = True
+    app.json.sort_keys = False
+
+    # Position/trail payloads repeat the same keys thousands of times and
+    # compress 5-10x even at the cheapest gzip level; tiny polls are skipped.
+    if Compress is not None:
+        app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+        app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+        app.config["COMPRESS_LEVEL"] = 1
+        app.config["COMPRESS_BR_LEVEL"] = 4
+        app.config["COMPRESS_MIN_SIZE"] = 2048
+        Compress(app)
+
     # Expose live tracker for real-time position serving
     from . import routes as _routes
     _routes._live_tracker = tracker
 
+    # Pooled Database handles, reused across requests so the connection, its
+    # PRAGMAs and its statement cache survive between polls
+    pool = app.extensions["db_pool"] = DatabasePool(app.config["DB_PATH"])
+    atexit.register(pool.close)
+
     @app.before_request
     def _open_db():
         from flask import g
         if not hasattr(g, "db"):
-            g.db = Database(app.config["DB_PATH"])
+            g.db = pool.acquire()
 
     @app.teardown_appcontext
     def _close_db(exc):
         from flask import g
         db = g.pop("db", None)
-        if db:
-            db.close()
+        if db is not None:
+            pool.release(db)
 
     # CORS for local dev
     @app.after_request
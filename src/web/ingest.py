@@ -106,7 +106,7 @@ def receive_frames():
             decoded += 1
             ac = tracker.aircraft.get(msg.icao)
             if ac:
-                events = _filter_engine.check(ac)
+                events = _filter_engine.check(ac, tracker.last_changed)
                 for event in events:
                     db.add_event(
                         icao=event.icao,
@@ -121,6 +121,8 @@ def receive_frames():
                 if ac.has_position:
                     positions += 1
 
+    tracker.flush()
+
     # Update receiver status
     _receiver_status[receiver_name] = {
         "name": receiver_name,
@@ -4,44 +4,247 @@ API endpoints (JSON):
   GET /api/aircraft          List all tracked aircraft (with optional filters)
   GET /api/aircraft/<icao>   Single aircraft detail + recent positions
   GET /api/positions         Recent positions (for map updates, 2s polling)
+  GET /api/positions/all     All positions, oldest first (for replay)
+  GET /api/query             Filtered position search (for the query builder)
   GET /api/trails            Position trails per aircraft (for map polylines)
   GET /api/heatmap           Position density data for heatmap layer
   GET /api/events            Recent events (military, emergency, anomaly)
+  GET /api/airports          Airport overlay
   GET /api/stats             Database statistics + receiver info
   GET /api/geofences         List configured geofences
   POST /api/geofences        Add a geofence
   DELETE /api/geofences/<id> Remove a geofence
+  GET /api/lookup/<icao>     hexdb.io aircraft info (cached)
 
 Page routes (HTML):
   GET /                      Map view (Leaflet.js)
   GET /table                 Aircraft table with sort/filter
   GET /aircraft/<icao>       Single aircraft detail + history
+  GET /query                 Query builder
+  GET /replay                Historical replay
   GET /events                Events dashboard
+  GET /receivers             Receiver management
   GET /stats                 Statistics dashboard
 """
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import threading
 import time
-
-from flask import Blueprint, Flask, g, jsonify, render_template, request
-
-# Module-level lookup cache: {icao: (result_dict, timestamp)}
-_lookup_cache: dict[str, tuple[dict, float]] = {}
+from collections import OrderedDict
+from dataclasses import dataclass
+from operator import attrgetter
+
+import numpy as np
+from flask import (
+    Blueprint,
+    Flask,
+    current_app,
+    g,
+    jsonify,
+    render_template,
+    request,
+    stream_with_context,
+)
+
+from .json_provider import OrjsonProvider
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None  # type: ignore[assignment]
+
+# Module-level lookup cache, LRU-ordered: {icao: (result_dict, expires_at)}
+_lookup_cache: OrderedDict[str, tuple[dict, float]] = OrderedDict()
 _LOOKUP_CACHE_TTL = 3600  # 1 hour
+_LOOKUP_NEGATIVE_TTL = 300  # Failed lookups are retried after 5 minutes
+_LOOKUP_CACHE_MAX = 10_000
+_lookup_lock = threading.Lock()
+# Lookups currently in flight: later callers for the same ICAO wait on the
+# first one instead of issuing their own upstream request
+_lookup_inflight: dict[str, threading.Event] = {}
+_LOOKUP_WAIT_TIMEOUT = 5.0  # Matches the upstream timeout; then fetch ourselves
+_LOOKUP_TIMEOUT = 5
+_LOOKUP_USER_AGENT = "adsb-decode/1.0"
+
+# Keep-alive session for hexdb.io so uncached lookups reuse one TCP+TLS
+# connection. Falls back to a fresh urllib connection per call without requests.
+_lookup_session = None
+if requests is not None:
+    _lookup_session = requests.Session()
+    _lookup_session.headers["User-Agent"] = _LOOKUP_USER_AGENT
+    _lookup_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 # Module-level geofence store (in-memory, survives across requests)
-# List of dicts: {id, name, lat, lon, radius_nm, description}
-_geofences: list[dict] = []
+# {id: {id, name, lat, lon, radius_nm, description}}, in insertion order
+_geofences: dict[int, dict] = {}
 _geofence_next_id = 1
+_geofence_lock = threading.Lock()
 
 # Live tracker reference — set by app.py when running with a dongle.
 # When set, /api/positions serves from in-memory state (~0.5s latency).
 # When None, falls back to DB queries (~2s latency).
 _live_tracker = None
 
+# Short-lived cache for the DB-backed /api/positions path so that many map
+# clients polling every 2s share one query: {(db_path, etag): (body, ts)}
+_positions_cache: dict[tuple, tuple[bytes, float]] = {}
+_positions_cache_lock = threading.Lock()
+_POSITIONS_CACHE_TTL = 1.0
+
+# Serialized bodies of _ttl_cached GET endpoints, shared by every client
+# polling with the same arguments: {(db_path, path, args): (body, etag, expires)}
+_response_cache: dict[tuple, tuple[bytes, str, float]] = {}
+_response_cache_lock = threading.Lock()
+
+# Rendered /table pages keyed by (db_path, last_seen 2s bucket, aircraft
+# count), so concurrent tabs share one render: {key: (html, ts)}
+_table_cache: dict[tuple, tuple[str, float]] = {}
+_table_cache_lock = threading.Lock()
+_TABLE_CACHE_TTL = 2.0
+
+# Airports overlay never changes while the process runs: serialized once,
+# then served as (body, etag)
+_airports_payload: tuple[bytes, str] | None = None
+
+# Float columns of the columnar /api/positions/all form. float64 keeps the
+# values identical to the row form; a missing value becomes NaN, which orjson
+# writes as null. Integer columns (altitude_ft, vertical_rate_fpm, ids) stay
+# plain lists so they serialize as ints and None.
+_POS_COLUMN_DTYPES = {
+    "lat": np.float64,
+    "lon": np.float64,
+    "speed_kts": np.float64,
+    "heading_deg": np.float64,
+    "timestamp": np.float64,
+    "is_military": np.bool_,
+}
+
+# Suffixes flask-compress appends to strong ETags of the bodies it encodes
+_COMPRESSED_ETAG_SUFFIXES = ("", ":gzip", ":br")
+
+# Prefix for ETags built from in-memory counters, which reset on restart
+_BOOT_ID = format(int(time.time()), "x")
+
 from ..enrichment import AIRPORTS
 
+# SQL for the polling endpoints, hoisted so the per-thread connection's
+# statement cache hits on the same string every request
+_SQL_AIRCRAFT_MARKER = (
+    "SELECT (SELECT version FROM data_versions WHERE name = 'aircraft'), "
+    "(SELECT cnt FROM row_counts WHERE name = 'aircraft')"
+)
+
+# The /table render cache only needs a coarse key: entries expire after
+# _TABLE_CACHE_TTL regardless, so staleness stays bounded under busy ingest
+_SQL_AIRCRAFT_TABLE_MARKER = (
+    "SELECT MAX(last_seen), (SELECT cnt FROM row_counts WHERE name = 'aircraft') FROM aircraft"
+)
+
+_SQL_POSITIONS_MARKER = (
+    "SELECT MAX(id), (SELECT cnt FROM row_counts WHERE name = 'positions') FROM positions"
+)
+
+_SQL_LIST_AIRCRAFT = "SELECT * FROM aircraft ORDER BY last_seen DESC"
+
+_SQL_LIST_MILITARY_AIRCRAFT = (
+    "SELECT * FROM aircraft WHERE is_military = 1 ORDER BY last_seen DESC"
+)
+
+_SQL_LATEST_POSITIONS = """
+    SELECT p.*, a.registration, a.country, a.is_military
+    FROM aircraft a
+    JOIN positions p ON p.id = a.last_position_id
+    WHERE p.timestamp >= ?
+    ORDER BY p.timestamp DESC
+"""
+
+# One sightings row per ICAO (the most recent), so aircraft seen across
+# several captures don't repeat every position once per sighting
+_SQL_ALL_POSITIONS_TEMPLATE = """
+    SELECT p.*, a.registration, a.country, a.is_military,
+           s.callsign
+    FROM positions p
+    JOIN aircraft a ON p.icao = a.icao
+    LEFT JOIN (
+        SELECT icao, callsign FROM (
+            SELECT icao, callsign,
+                   ROW_NUMBER() OVER (PARTITION BY icao ORDER BY last_seen DESC) AS rn
+            FROM sightings
+        ) WHERE rn = 1
+    ) s ON s.icao = p.icao
+    {where}
+    ORDER BY p.timestamp ASC, p.id ASC
+    LIMIT ?
+"""
+
+_SQL_ALL_POSITIONS = _SQL_ALL_POSITIONS_TEMPLATE.format(where="")
+# Keyset page: seeks idx_positions_timestamp instead of re-reading from the start.
+# The (timestamp, id) row value keeps rows sharing a timestamp from being skipped.
+_SQL_ALL_POSITIONS_AFTER = _SQL_ALL_POSITIONS_TEMPLATE.format(
+    where="WHERE (p.timestamp, p.id) > (?, ?)"
+)
+
+_SQL_AIRCRAFT_DETAIL = """
+    SELECT a.*, s.callsign AS sighting_callsign, s.squawk AS sighting_squawk
+    FROM aircraft a
+    LEFT JOIN sightings s ON s.id = (
+        SELECT MAX(id) FROM sightings WHERE icao = a.icao
+    )
+    WHERE a.icao = ?
+"""
+
+# "+icao" keeps the planner from walking all of idx_positions_icao_ts to get
+# partition order; the time window is narrow, so range-scan
+# idx_positions_timestamp and sort the few rows it returns instead.
+_SQL_TRAILS = """
+    SELECT icao, lat, lon, altitude_ft, heading_deg, speed_kts FROM (
+        SELECT icao, lat, lon, altitude_ft, heading_deg, speed_kts, timestamp,
+               ROW_NUMBER() OVER (PARTITION BY +icao ORDER BY timestamp ASC) AS rn
+        FROM positions WHERE timestamp >= ?
+    )
+    WHERE rn <= ?
+    ORDER BY icao, timestamp ASC
+"""
+
+_HEATMAP_MAX_POINTS = 50000
+
+_SQL_HEATMAP_COUNT = "SELECT COUNT(*) FROM positions WHERE timestamp >= ?"
+
+# Roughly one row in stride. A plain id % stride aliases with the
+# round-robin order positions are inserted in (stride a multiple of the
+# aircraft count keeps only one aircraft), so the id goes through a
+# multiplicative (Fibonacci) hash first and the row is kept when the
+# 32-bit hash falls in the lowest 1/stride of its range. The test is
+# answered from idx_positions_timestamp entries, so skipped rows never
+# touch the table. The product stays within int64 for ids below ~3.4e9.
+# Five decimals (~1 m) is plenty for density and trims the JSON.
+_SQL_HEATMAP = """
+    SELECT round(lat, 5), round(lon, 5), altitude_ft FROM positions
+    WHERE timestamp >= ? AND (id * 2654435761) % 4294967296 < 4294967296 / ?
+    LIMIT ?
+"""
+
+_SQL_EVENTS_MARKER = (
+    "SELECT MAX(id), (SELECT cnt FROM row_counts WHERE name = 'events') FROM events"
+)
+
+# Newest receiver and newest capture start in one row; NULLs when absent
+_SQL_STATS_CONTEXT = """
+    SELECT r.name, r.lat, r.lon, c.start_time
+    FROM (SELECT 1)
+    LEFT JOIN (
+        SELECT name, lat, lon FROM receivers ORDER BY created_at DESC LIMIT 1
+    ) r
+    LEFT JOIN (
+        SELECT start_time FROM captures ORDER BY start_time DESC LIMIT 1
+    ) c
+"""
+
+
 api = Blueprint("api", __name__, url_prefix="/api")
 pages = Blueprint("pages", __name__)
 
@@ -50,6 +253,236 @@ def _db():
     return g.db
 
 
+def _lookup_cache_get(icao: str) -> dict | None:
+    """Return a cached, unexpired lookup result and mark it recently used."""
+    with _lookup_lock:
+        entry = _lookup_cache.get(icao)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del _lookup_cache[icao]
+            return None
+        _lookup_cache.move_to_end(icao)
+        return entry[0]
+
+
+def _lookup_cache_put(icao: str, result: dict, ttl: float):
+    """Store a lookup result, evicting least recently used entries past the cap."""
+    with _lookup_lock:
+        _lookup_cache[icao] = (result, time.time() + ttl)
+        _lookup_cache.move_to_end(icao)
+        while len(_lookup_cache) > _LOOKUP_CACHE_MAX:
+            _lookup_cache.popitem(last=False)
+
+
+def _http_get_json(url: str) -> dict:
+    """GET a JSON document, over the pooled session when requests is installed."""
+    if _lookup_session is not None:
+        resp = _lookup_session.get(url, timeout=_LOOKUP_TIMEOUT)
+        resp.raise_for_status()
+        return resp.json()
+
+    import urllib.request
+    import json as _json
+
+    req = urllib.request.Request(url, headers={"User-Agent": _LOOKUP_USER_AGENT})
+    with urllib.request.urlopen(req, timeout=_LOOKUP_TIMEOUT) as resp:
+        return _json.loads(resp.read().decode())
+
+
+def _fetch_lookup(icao: str) -> dict:
+    """Query hexdb.io for one aircraft. Errors are reported in the result."""
+    result = {"icao": icao, "source": "hexdb.io"}
+    try:
+        data = _http_get_json(f"https://hexdb.io/api/v1/aircraft/{icao}")
+        result.update({
+            "registration": data.get("Registration", ""),
+            "manufacturer": data.get("Manufacturer", ""),
+            "type_code": data.get("ICAOTypeCode", ""),
+            "type": data.get("Type", ""),
+            "owner": data.get("RegisteredOwners", ""),
+            "operator_code": data.get("OperatorFlagCode", ""),
+        })
+    except Exception:
+        result["error"] = "Lookup failed"
+    return result
+
+
+def _etag_matches(etag: str) -> bool:
+    """True if If-None-Match names this ETag.
+
+    flask-compress rewrites strong ETags on compressed bodies to
+    "<etag>:gzip" / "<etag>:br", so those forms count as a match too.
+    """
+    if_none_match = request.if_none_match
+    return any(if_none_match.contains_weak(etag + suffix) for suffix in _COMPRESSED_ETAG_SUFFIXES)
+
+
+def _not_modified(etag: str):
+    """Return a 304 response if the client already holds this ETag, else None."""
+    if _etag_matches(etag):
+        return _with_etag(current_app.response_class(status=304), etag)
+    return None
+
+
+def _with_etag(resp, etag: str):
+    """Tag a polling response so the next poll can be answered with a 304.
+
+    The validator is weak: flask-compress leaves weak ETags untouched, so the
+    client echoes back exactly what _not_modified compares against.
+    """
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "max-age=1"
+    return resp
+
+
+def _cache_store(cache: dict, lock: threading.Lock, key, entry, expired):
+    """Insert entry into a shared response cache, dropping stale entries first.
+
+    Threaded servers poll these caches concurrently; the prune iterates the
+    dict, so it and the insert run under the cache's lock.
+    """
+    with lock:
+        for k in [k for k, e in cache.items() if expired(e)]:
+            del cache[k]
+        cache[key] = entry
+
+
+def _position_dicts(cursor):
+    """Yield position rows as dicts with is_military coerced to bool.
+
+    Expects a cursor from _tuple_cursor: keys come from cursor.description
+    once per query instead of Row.keys() on every row.
+    """
+    cols = tuple(d[0] for d in cursor.description)
+    for row in cursor:
+        p = dict(zip(cols, row))
+        p["is_military"] = bool(p.get("is_military", 0))
+        yield p
+
+
+@dataclass(frozen=True, slots=True)
+class _QueryArgs:
+    """Validated /api/query parameters."""
+
+    min_alt: int | None
+    max_alt: int | None
+    icao: str
+    military: bool | None  # None = both
+    limit: int
+    columnar: bool
+
+
+def _parse_query_args(args) -> _QueryArgs:
+    """Parse and bound /api/query's request.args in one pass."""
+    military = args.get("military")
+    return _QueryArgs(
+        min_alt=args.get("min_alt", type=int),
+        max_alt=args.get("max_alt", type=int),
+        icao=args.get("icao", "").upper(),
+        military={"1": True, "0": False}.get(military),
+        limit=min(args.get("limit", 5000, type=int), 50000),
+        columnar=args.get("format") == "columns",
+    )
+
+
+def _tuple_cursor(db, sql: str, params=()):
+    """Execute on a cursor that returns plain tuples instead of sqlite3.Row."""
+    cursor = db.conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params)
+
+
+def _ttl_cached(ttl: float):
+    """Serve a JSON GET endpoint from _response_cache for ttl seconds.
+
+    Keyed on database, path and query args. The body is ETagged by content,
+    so a poller whose copy is still current gets a 304 even across a refresh.
+    The view's body is buffered into the cache, so cached views should return
+    a materialised response such as jsonify, not a _stream_list stream.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (
+                current_app.config["DB_PATH"],
+                request.path,
+                tuple(sorted(request.args.items(multi=True))),
+            )
+            now = time.time()
+            entry = _response_cache.get(key)
+            if entry is None or entry[2] <= now:
+                resp = view(*args, **kwargs)
+                if resp.status_code != 200:
+                    return resp
+                body = resp.get_data()
+                entry = (body, hashlib.blake2b(body, digest_size=8).hexdigest(), now + ttl)
+                _cache_store(
+                    _response_cache, _response_cache_lock, key, entry, lambda e: e[2] <= now
+                )
+            body, etag, _ = entry
+            if (resp := _not_modified(etag)) is not None:
+                return resp
+            resp = current_app.response_class(body, mimetype="application/json")
+            return _with_etag(resp, etag)
+        return wrapper
+    return decorator
+
+
+def _columnar_positions(cursor):
+    """Return {"columns": {name: [...]}, "count": N} for a position cursor.
+
+    One array per column instead of one object per row, so keys are not
+    repeated 50k times. Numeric columns become NumPy arrays when the orjson
+    provider is installed; the stdlib encoder gets plain lists.
+    """
+    cols = tuple(d[0] for d in cursor.description)
+    rows = cursor.fetchall()
+    values = list(zip(*rows)) if rows else [()] * len(cols)
+    columns = dict(zip(cols, values))
+    if isinstance(current_app.json, OrjsonProvider):
+        for name, dtype in _POS_COLUMN_DTYPES.items():
+            if name in columns:
+                columns[name] = np.array(columns[name], dtype=dtype)
+    else:
+        columns["is_military"] = [bool(v) for v in columns.get("is_military", ())]
+    return jsonify({"columns": columns, "count": len(rows)})
+
+
+def _stream_list(key: str, items, chunk_rows: int = 500):
+    """Stream {key: [...], "count": N} from an iterable of JSON-able items.
+
+    Items are serialized as they come off SQLite and sent in chunks, so a
+    50k-row response never exists as a Python list. "count" goes last
+    because it is only known at the end.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield f'{{"{key}":['
+        count = 0
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            count += 1
+            if len(chunk) >= chunk_rows:
+                # One encoder call per chunk; [1:-1] drops the list brackets
+                yield ("," if count > len(chunk) else "") + dumps(chunk)[1:-1]
+                chunk = []
+        if chunk:
+            yield ("," if count > len(chunk) else "") + dumps(chunk)[1:-1]
+        yield f'],"count":{count}}}'
+
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype="application/json"
+    )
+
+
+def _stream_positions(cursor):
+    """Stream {"positions": [...], "count": N} from a _tuple_cursor."""
+    return _stream_list("positions", _position_dicts(cursor))
+
+
 # --- API Routes ---
 
 @api.route("/aircraft")
@@ -58,19 +491,20 @@ def list_aircraft():
     db = _db()
     military_only = request.args.get("military", "").lower() == "true"
 
-    rows = db.conn.execute(
-        "SELECT * FROM aircraft ORDER BY last_seen DESC"
-    ).fetchall()
+    # Trigger-maintained version: moves on any aircraft insert, delete or change
+    marker = db.conn.execute(_SQL_AIRCRAFT_MARKER).fetchone()
+    etag = f"ac-{marker[0]}-{marker[1]}"
+    if (resp := _not_modified(etag)) is not None:
+        return resp
 
+    sql = _SQL_LIST_MILITARY_AIRCRAFT if military_only else _SQL_LIST_AIRCRAFT
     aircraft = []
-    for row in rows:
+    for row in db.conn.execute(sql):
         ac = dict(row)
         ac["is_military"] = bool(ac["is_military"])
-        if military_only and not ac["is_military"]:
-            continue
         aircraft.append(ac)
 
-    return jsonify({"aircraft": aircraft, "count": len(aircraft)})
+    return _with_etag(jsonify({"aircraft": aircraft, "count": len(aircraft)}), etag)
 
 
 @api.route("/aircraft/<icao>")
@@ -107,14 +541,27 @@ def recent_positions():
 
     # Fast path: serve from live tracker memory
     if _live_tracker is not None:
+        # valid_frames moves on every decoded message; the 10s bucket lets
+        # aircraft age out of a minutes window while no frames arrive
+        etag = f"{_BOOT_ID}-{_live_tracker.valid_frames}-{minutes}-{int(now // 10) if minutes else 0}"
+        if (resp := _not_modified(etag)) is not None:
+            return resp
+        # Last body built for this app's tracker, so every map client polling
+        # between two decoded frames shares one build: (tracker, etag, body)
+        cached = current_app.extensions.get("live_positions_payload")
+        if cached and cached[0] is _live_tracker and cached[1] == etag:
+            resp = current_app.response_class(cached[2], mimetype="application/json")
+            return _with_etag(resp, etag)
         cutoff = now - (max(1, min(minutes, 525600)) * 60) if minutes else 0
-        positions = []
-        for ac in _live_tracker.aircraft.values():
-            if ac.lat is None or ac.lon is None:
-                continue
-            if cutoff and ac.last_seen < cutoff:
-                continue
-            positions.append({
+        # Filter and sort the slotted AircraftState objects first, then build
+        # one dict per survivor
+        visible = [
+            ac for ac in _live_tracker.aircraft.values()
+            if ac.lat is not None and ac.lon is not None and ac.last_seen >= cutoff
+        ]
+        visible.sort(key=attrgetter("last_seen"), reverse=True)
+        positions = [
+            {
                 "icao": ac.icao,
                 "lat": ac.lat,
                 "lon": ac.lon,
@@ -126,42 +573,70 @@ def recent_positions():
                 "registration": ac.registration,
                 "country": ac.country,
                 "is_military": ac.is_military,
-            })
-        positions.sort(key=lambda p: p["timestamp"], reverse=True)
-        return jsonify({"positions": positions, "count": len(positions)})
+            }
+            for ac in visible
+        ]
+        resp = jsonify({"positions": positions, "count": len(positions)})
+        current_app.extensions["live_positions_payload"] = (_live_tracker, etag, resp.get_data())
+        return _with_etag(resp, etag)
 
-    # Slow path: query DB
+    # Slow path: query DB. Positions change by insert (MAX(id) moves) or
+    # prune (count drops); the bucket ages rows out of a minutes window.
     db = _db()
+    marker = db.conn.execute(_SQL_POSITIONS_MARKER).fetchone()
+    etag = f"pos-{marker[0]}-{marker[1]}-{minutes}-{int(now // 10) if minutes else 0}"
+    if (resp := _not_modified(etag)) is not None:
+        return resp
+
+    # Body shared across clients for up to 1s while the marker is unchanged
+    key = (current_app.config["DB_PATH"], etag)
+    cached = _positions_cache.get(key)
+    if cached and now - cached[1] < _POSITIONS_CACHE_TTL:
+        resp = current_app.response_class(cached[0], mimetype="application/json")
+        return _with_etag(resp, etag)
+
+    cutoff = 0.0
     if minutes is not None:
         minutes = max(1, min(minutes, 525600))  # 1 min to 1 year
         cutoff = now - (minutes * 60)
-        rows = db.conn.execute("""
-            SELECT p.*, a.registration, a.country, a.is_military
-            FROM positions p
-            JOIN aircraft a ON p.icao = a.icao
-            WHERE p.id IN (
-                SELECT MAX(id) FROM positions GROUP BY icao
-            ) AND p.timestamp >= ?
-            ORDER BY p.timestamp DESC
-        """, (cutoff,)).fetchall()
-    else:
-        rows = db.conn.execute("""
-            SELECT p.*, a.registration, a.country, a.is_military
-            FROM positions p
-            JOIN aircraft a ON p.icao = a.icao
-            WHERE p.id IN (
-                SELECT MAX(id) FROM positions GROUP BY icao
-            )
-            ORDER BY p.timestamp DESC
-        """).fetchall()
+    # Latest position per aircraft via the trigger-maintained
+    # aircraft.last_position_id: one primary-key lookup each
+    positions = list(_position_dicts(_tuple_cursor(db, _SQL_LATEST_POSITIONS, (cutoff,))))
+
+    resp = jsonify({"positions": positions, "count": len(positions)})
+    _cache_store(
+        _positions_cache, _positions_cache_lock, key, (resp.get_data(), now),
+        lambda e: now - e[1] >= _POSITIONS_CACHE_TTL,
+    )
+    return _with_etag(resp, etag)
 
-    positions = []
-    for row in rows:
-        p = dict(row)
-        p["is_military"] = bool(p.get("is_military", 0))
-        positions.append(p)
 
-    return jsonify({"positions": positions, "count": len(positions)})
+@functools.lru_cache(maxsize=32)
+def _query_sql(min_alt: bool, max_alt: bool, icao: bool, military: bool | None) -> str:
+    """SQL for one /api/query filter combination.
+
+    Returning the identical string object per combination lets sqlite3's
+    per-connection statement cache reuse the prepared statement.
+    """
+    clauses = ["1=1"]
+    if min_alt:
+        clauses.append("p.altitude_ft >= ?")
+    if max_alt:
+        clauses.append("p.altitude_ft <= ?")
+    if icao:
+        clauses.append("p.icao = ?")
+    if military is True:
+        clauses.append("a.is_military = 1")
+    elif military is False:
+        clauses.append("a.is_military = 0")
+    return f"""
+        SELECT p.*, a.registration, a.country, a.is_military
+        FROM positions p
+        JOIN aircraft a ON p.icao = a.icao
+        WHERE {" AND ".join(clauses)}
+        ORDER BY p.timestamp DESC
+        LIMIT ?
+    """
 
 
 @api.route("/query")
@@ -174,62 +649,54 @@ def query_positions():
         icao: Filter by ICAO address
         military: 1 for military only, 0 for civilian only
         limit: Max results (default 5000)
+        format: "columns" for the columnar form /api/positions/all uses
     """
     db = _db()
-    clauses = ["1=1"]
+    q = _parse_query_args(request.args)
     params = []
 
-    min_alt = request.args.get("min_alt", type=int)
-    max_alt = request.args.get("max_alt", type=int)
-    icao_filter = request.args.get("icao", "").upper()
-    military = request.args.get("military")
-    limit = min(request.args.get("limit", 5000, type=int), 50000)
-
-    if min_alt is not None:
-        clauses.append("p.altitude_ft >= ?")
-        params.append(min_alt)
-    if max_alt is not None:
-        clauses.append("p.altitude_ft <= ?")
-        params.append(max_alt)
-    if icao_filter:
-        clauses.append("p.icao = ?")
-        params.append(icao_filter)
-    if military == "1":
-        clauses.append("a.is_military = 1")
-    elif military == "0":
-        clauses.append("a.is_military = 0")
+    if q.min_alt is not None:
+        params.append(q.min_alt)
+    if q.max_alt is not None:
+        params.append(q.max_alt)
+    if q.icao:
+        params.append(q.icao)
+    params.append(q.limit)
 
-    where = " AND ".join(clauses)
-    params.append(limit)
-
-    rows = db.conn.execute(f"""
-        SELECT p.*, a.registration, a.country, a.is_military
-        FROM positions p
-        JOIN aircraft a ON p.icao = a.icao
-        WHERE {where}
-        ORDER BY p.timestamp DESC
-        LIMIT ?
-    """, params).fetchall()
-
-    positions = []
-    for row in rows:
-        p = dict(row)
-        p["is_military"] = bool(p.get("is_military", 0))
-        positions.append(p)
+    sql = _query_sql(q.min_alt is not None, q.max_alt is not None, bool(q.icao), q.military)
+    cursor = _tuple_cursor(db, sql, params)
 
-    return jsonify({"positions": positions, "count": len(positions)})
+    if q.columnar:
+        return _columnar_positions(cursor)
+    return _stream_positions(cursor)
 
 
 @api.route("/airports")
 def list_airports():
-    """List all known airports for map overlay."""
-    from ..enrichment import _AIRPORT_TYPES
-    airports = [
-        {"icao": code, "name": name, "lat": lat, "lon": lon,
-         "elevation_ft": elev, "type": _AIRPORT_TYPES.get(code, "small_airport")}
-        for code, name, lat, lon, elev in AIRPORTS
-    ]
-    return jsonify({"airports": airports, "count": len(airports)})
+    """List all known airports for map overlay.
+
+    AIRPORTS is fixed at import, so the body is built once and served with a
+    weak ETag and a one-day Cache-Control.
+    """
+    global _airports_payload
+    if _airports_payload is None:
+        from ..enrichment import _AIRPORT_TYPES
+        airports = [
+            {"icao": code, "name": name, "lat": lat, "lon": lon,
+             "elevation_ft": elev, "type": _AIRPORT_TYPES.get(code, "small_airport")}
+            for code, name, lat, lon, elev in AIRPORTS
+        ]
+        body = jsonify({"airports": airports, "count": len(airports)}).get_data()
+        _airports_payload = (body, hashlib.blake2b(body, digest_size=8).hexdigest())
+
+    body, etag = _airports_payload
+    if _etag_matches(etag):
+        resp = current_app.response_class(status=304)
+    else:
+        resp = current_app.response_class(body, mimetype="application/json")
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "public, max-age=86400"
+    return resp
 
 
 @api.route("/positions/all")
@@ -237,30 +704,32 @@ def all_positions():
     """All positions in the database, ordered by timestamp.
 
     Used by the replay page. Returns all position records with aircraft info.
+    ?format=columns returns {"columns": {name: [...]}, "count": N} instead
+    of a list of row objects.
+    Query params:
+        limit: Page size (default: 10000, max: 50000)
+        after: Keyset cursor — only positions with a later timestamp
+        after_id: Tie-break for `after`; positions at exactly `after` with a
+            higher id are included. Pass the last row's timestamp and id to
+            fetch the next page; a page shorter than `limit` is the last.
     """
     db = _db()
     limit = min(request.args.get("limit", 10000, type=int), 50000)
+    after = request.args.get("after", type=float)
 
-    rows = db.conn.execute("""
-        SELECT p.*, a.registration, a.country, a.is_military,
-               s.callsign
-        FROM positions p
-        JOIN aircraft a ON p.icao = a.icao
-        LEFT JOIN sightings s ON s.icao = p.icao
-        ORDER BY p.timestamp ASC
-        LIMIT ?
-    """, (limit,)).fetchall()
-
-    positions = []
-    for row in rows:
-        p = dict(row)
-        p["is_military"] = bool(p.get("is_military", 0))
-        positions.append(p)
+    if after is None:
+        cursor = _tuple_cursor(db, _SQL_ALL_POSITIONS, (limit,))
+    else:
+        after_id = request.args.get("after_id", 2**63 - 1, type=int)
+        cursor = _tuple_cursor(db, _SQL_ALL_POSITIONS_AFTER, (after, after_id, limit))
 
-    return jsonify({"positions": positions, "count": len(positions)})
+    if request.args.get("format") == "columns":
+        return _columnar_positions(cursor)
+    return _stream_positions(cursor)
 
 
 @api.route("/trails")
+@_ttl_cached(5.0)
 def get_trails():
     """Position trails for all active aircraft.
 
@@ -275,30 +744,21 @@ def get_trails():
 
     cutoff = time.time() - (minutes * 60)
 
-    # Get all aircraft with positions in the time window
-    rows = db.conn.execute(
-        """SELECT DISTINCT icao FROM positions WHERE timestamp >= ?""",
-        (cutoff,),
-    ).fetchall()
-
-    trails = {}
-    for row in rows:
-        icao = row["icao"]
-        positions = db.conn.execute(
-            """SELECT lat, lon, altitude_ft, heading_deg, speed_kts, timestamp
-               FROM positions WHERE icao = ? AND timestamp >= ?
-               ORDER BY timestamp ASC LIMIT ?""",
-            (icao, cutoff, limit),
-        ).fetchall()
-        trails[icao] = [
-            [p["lat"], p["lon"], p["altitude_ft"], p["heading_deg"], p["speed_kts"]]
-            for p in positions
-        ]
+    # One windowed query for every aircraft: oldest `limit` points per ICAO
+    rows = db.conn.execute(_SQL_TRAILS, (cutoff, limit))
+
+    trails: dict[str, list] = {}
+    for icao, lat, lon, alt, hdg, spd in rows:
+        trail = trails.get(icao)
+        if trail is None:
+            trail = trails[icao] = []
+        trail.append([lat, lon, alt, hdg, spd])
 
     return jsonify({"trails": trails})
 
 
 @api.route("/heatmap")
+@_ttl_cached(30.0)
 def heatmap_data():
     """Position density data for heatmap layer.
 
@@ -311,15 +771,13 @@ def heatmap_data():
     minutes = max(1, min(request.args.get("minutes", 1440, type=int), 10080))
     cutoff = time.time() - (minutes * 60)
 
-    # Sample up to 50k points — enough for density without killing the browser
-    rows = db.conn.execute("""
-        SELECT lat, lon, altitude_ft FROM positions
-        WHERE timestamp >= ?
-        ORDER BY timestamp DESC
-        LIMIT 50000
-    """, (cutoff,)).fetchall()
-
-    points = [[r["lat"], r["lon"], r["altitude_ft"]] for r in rows]
+    # Up to 50k points — enough for density without killing the browser —
+    # spread evenly over the window instead of the newest 50k.
+    total = db.conn.execute(_SQL_HEATMAP_COUNT, (cutoff,)).fetchone()[0]
+    stride = max(1, -(-total // _HEATMAP_MAX_POINTS))
+    # Plain (lat, lon, alt) tuples encode as JSON arrays as-is. Not streamed:
+    # _ttl_cached buffers the body anyway.
+    points = _tuple_cursor(db, _SQL_HEATMAP, (cutoff, stride, _HEATMAP_MAX_POINTS)).fetchall()
     return jsonify({"points": points, "count": len(points)})
 
 
@@ -329,33 +787,33 @@ def list_events():
     db = _db()
     event_type = request.args.get("type")
     limit = min(request.args.get("limit", 50, type=int), 5000)
+
+    # Latest event id plus the row count (for prunes) identifies the event set
+    marker = db.conn.execute(_SQL_EVENTS_MARKER).fetchone()
+    etag = f"ev-{marker[0]}-{marker[1]}"
+    if (resp := _not_modified(etag)) is not None:
+        return resp
+
     events = db.get_events(event_type=event_type, limit=limit)
-    return jsonify({"events": events, "count": len(events)})
+    return _with_etag(jsonify({"events": events, "count": len(events)}), etag)
 
 
 @api.route("/stats")
+@_ttl_cached(5.0)
 def get_stats():
-    """Database statistics with receiver info."""
+    """Database statistics with receiver info.
+
+    Counts are approximate by nature, so one body is shared for 5s.
+    """
     db = _db()
     s = db.stats()
 
-    # Add receiver location for map centering
-    receiver = db.conn.execute(
-        "SELECT * FROM receivers ORDER BY created_at DESC LIMIT 1"
-    ).fetchone()
-    if receiver:
-        s["receiver"] = {
-            "name": receiver["name"],
-            "lat": receiver["lat"],
-            "lon": receiver["lon"],
-        }
-
-    # Add capture start time for uptime calculation
-    capture = db.conn.execute(
-        "SELECT start_time FROM captures ORDER BY start_time DESC LIMIT 1"
-    ).fetchone()
-    if capture:
-        s["capture_start"] = capture["start_time"]
+    # Receiver location for map centering, capture start for uptime
+    name, lat, lon, start_time = db.conn.execute(_SQL_STATS_CONTEXT).fetchone()
+    if name is not None:
+        s["receiver"] = {"name": name, "lat": lat, "lon": lon}
+    if start_time is not None:
+        s["capture_start"] = start_time
 
     return jsonify(s)
 
@@ -363,7 +821,8 @@ def get_stats():
 @api.route("/geofences", methods=["GET"])
 def list_geofences():
     """List all configured geofences."""
-    return jsonify({"geofences": _geofences, "count": len(_geofences)})
+    fences = list(_geofences.values())
+    return jsonify({"geofences": fences, "count": len(fences)})
 
 
 @api.route("/geofences", methods=["POST"])
@@ -393,26 +852,26 @@ def add_geofence():
     if radius_nm <= 0 or radius_nm > 500:
         return jsonify({"error": "radius_nm must be 0-500"}), 400
 
-    fence = {
-        "id": _geofence_next_id,
-        "name": name,
-        "lat": lat,
-        "lon": lon,
-        "radius_nm": radius_nm,
-        "description": data.get("description", ""),
-    }
-    _geofences.append(fence)
-    _geofence_next_id += 1
+    with _geofence_lock:
+        fence = {
+            "id": _geofence_next_id,
+            "name": name,
+            "lat": lat,
+            "lon": lon,
+            "radius_nm": radius_nm,
+            "description": data.get("description", ""),
+        }
+        _geofences[fence["id"]] = fence
+        _geofence_next_id += 1
     return jsonify(fence), 201
 
 
 @api.route("/geofences/<int:fence_id>", methods=["DELETE"])
 def delete_geofence(fence_id: int):
     """Remove a geofence by ID."""
-    global _geofences
-    before = len(_geofences)
-    _geofences = [f for f in _geofences if f["id"] != fence_id]
-    if len(_geofences) == before:
+    with _geofence_lock:
+        removed = _geofences.pop(fence_id, None)
+    if removed is None:
         return jsonify({"error": "Geofence not found"}), 404
     return jsonify({"deleted": fence_id})
 
@@ -422,35 +881,35 @@ def lookup_aircraft(icao: str):
     """Proxy lookup to hexdb.io for aircraft metadata.
 
     Returns manufacturer, type, owner, registration from external DB.
-    Cached in-memory for the session to avoid repeated external calls.
+    Cached in-memory (bounded LRU, 1h TTL; failures 5 min) to avoid
+    repeated external calls. Concurrent requests for the same ICAO share
+    one upstream call; followers wait up to 5s before fetching themselves.
     """
     icao = icao.upper()
-    # Module-level cache with TTL
-    cached = _lookup_cache.get(icao)
-    if cached and time.time() - cached[1] < _LOOKUP_CACHE_TTL:
-        return jsonify(cached[0])
+    cached = _lookup_cache_get(icao)
+    if cached is not None:
+        return jsonify(cached)
 
-    import urllib.request
-    import json as _json
+    with _lookup_lock:
+        event = _lookup_inflight.get(icao)
+        leader = event is None
+        if leader:
+            event = _lookup_inflight[icao] = threading.Event()
 
-    result = {"icao": icao, "source": "hexdb.io"}
-    try:
-        url = f"https://hexdb.io/api/v1/aircraft/{icao}"
-        req = urllib.request.Request(url, headers={"User-Agent": "adsb-decode/1.0"})
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            data = _json.loads(resp.read().decode())
-            result.update({
-                "registration": data.get("Registration", ""),
-                "manufacturer": data.get("Manufacturer", ""),
-                "type_code": data.get("ICAOTypeCode", ""),
-                "type": data.get("Type", ""),
-                "owner": data.get("RegisteredOwners", ""),
-                "operator_code": data.get("OperatorFlagCode", ""),
-            })
-    except Exception:
-        result["error"] = "Lookup failed"
+    if not leader and event.wait(timeout=_LOOKUP_WAIT_TIMEOUT):
+        cached = _lookup_cache_get(icao)
+        if cached is not None:
+            return jsonify(cached)
 
-    _lookup_cache[icao] = (result, time.time())
+    try:
+        result = _fetch_lookup(icao)
+        ttl = _LOOKUP_NEGATIVE_TTL if "error" in result else _LOOKUP_CACHE_TTL
+        _lookup_cache_put(icao, result, ttl)
+    finally:
+        if leader:
+            with _lookup_lock:
+                _lookup_inflight.pop(icao, None)
+            event.set()
     return jsonify(result)
 
 
@@ -466,11 +925,22 @@ def map_view():
 def table_view():
     """Aircraft table view."""
     db = _db()
-    rows = db.conn.execute(
-        "SELECT * FROM aircraft ORDER BY last_seen DESC"
-    ).fetchall()
-    aircraft = [dict(r) for r in rows]
-    return render_template("table.html", aircraft=aircraft)
+    now = time.time()
+    marker = db.conn.execute(_SQL_AIRCRAFT_TABLE_MARKER).fetchone()
+    key = (current_app.config["DB_PATH"], int(marker[0] or 0) // 2, marker[1])
+    cached = _table_cache.get(key)
+    if cached and now - cached[1] < _TABLE_CACHE_TTL:
+        return cached[0]
+
+    # Jinja iterates the cursor directly; sqlite3.Row serves ac.icao via
+    # item lookup, so no list of dicts is built first
+    cursor = db.conn.execute(_SQL_LIST_AIRCRAFT)
+    html = render_template("table.html", aircraft=cursor, count=marker[1])
+    _cache_store(
+        _table_cache, _table_cache_lock, key, (html, now),
+        lambda e: now - e[1] >= _TABLE_CACHE_TTL,
+    )
+    return html
 
 
 @pages.route("/aircraft/<icao>")
@@ -478,22 +948,23 @@ def aircraft_detail(icao: str):
     """Single aircraft detail page with split-screen external intel."""
     db = _db()
     icao = icao.upper()
-    ac = db.get_aircraft(icao)
-    if not ac:
+    # Aircraft row and its latest sighting (callsign, squawk) in one query
+    row = db.conn.execute(_SQL_AIRCRAFT_DETAIL, (icao,)).fetchone()
+    if not row:
         return "Aircraft not found", 404
+    ac = dict(row)
+    sighting = {
+        "callsign": ac.pop("sighting_callsign"),
+        "squawk": ac.pop("sighting_squawk"),
+    }
     positions = db.get_positions(icao, limit=500)
     events = db.get_events(icao=icao)
-    # Get sighting info (callsign, squawk)
-    sighting = db.conn.execute(
-        "SELECT callsign, squawk FROM sightings WHERE icao = ? ORDER BY id DESC LIMIT 1",
-        (icao,),
-    ).fetchone()
     return render_template(
         "detail.html",
         aircraft=ac,
         positions=positions,
         events=events,
-        sighting=dict(sighting) if sighting else {},
+        sighting=sighting,
     )
 
 
@@ -0,0 +1,14 @@
+// Helpers for the columnar ?format=columns API payloads, shared by the
+// query and replay pages.
+
+// Rebuild row objects from the columnar payload
+function fromColumns(columns, count) {
+    const keys = Object.keys(columns);
+    const rows = new Array(count);
+    for (let i = 0; i < count; i++) {
+        const row = {};
+        for (const k of keys) row[k] = columns[k][i];
+        rows[i] = row;
+    }
+    return rows;
+}
@@ -69,3 +69,10 @@ ICAO_VECTORS = [
     ("40621D", "United Kingdom", False),
     ("3C6586", "Germany", False),
 ]
+
+# Pre-decoded forms of the frame tables above: same tuples with the hex
+# string replaced by its bytes, so loops over every vector skip fromhex.
+IDENTIFICATION_FRAMES_BYTES = tuple((bytes.fromhex(h), *rest) for h, *rest in IDENTIFICATION_FRAMES)
+POSITION_FRAMES_BYTES = tuple((bytes.fromhex(h), *rest) for h, *rest in POSITION_FRAMES)
+VELOCITY_FRAMES_BYTES = tuple((bytes.fromhex(h), *rest) for h, *rest in VELOCITY_FRAMES)
+CRC_VECTORS_BYTES = tuple((bytes.fromhex(h), exp) for h, exp in CRC_VECTORS)
@@ -1,9 +1,17 @@
-"""Tests for CLI commands."""
+"""Tests for CLI commands.
+
+One CliRunner smoke test per command covers argument parsing; the rest call
+the command callbacks directly and read stdout through capsys.
+"""
+
+import shutil
+import sqlite3
+from contextlib import closing
 
 import pytest
 from click.testing import CliRunner
 
-from src.cli import cli
+from src.cli import cli, decode, export_cmd, history, track
 from src.database import Database
 
 
@@ -12,30 +20,39 @@ def runner():
     return CliRunner()
 
 
-@pytest.fixture
-def hex_file(tmp_path):
-    """Create a sample hex frame file."""
+@pytest.fixture(scope="module")
+def hex_file(tmp_path_factory):
+    """Create a sample hex frame file, shared read-only across the module."""
     frames = [
         "8D4840D6202CC371C32CE0576098",  # Identification: KLM1023
         "8D40621D58C382D690C8AC2863A7",  # Position even
         "8D40621D58C386435CC412692AD6",  # Position odd
         "8D485020994409940838175B284F",  # Velocity
     ]
-    f = tmp_path / "test_frames.txt"
+    f = tmp_path_factory.mktemp("frames") / "test_frames.txt"
     f.write_text("\n".join(frames) + "\n")
     return str(f)
 
 
+@pytest.fixture(scope="module")
+def seed_db(tmp_path_factory):
+    """Build the sample database once per module."""
+    db_path = tmp_path_factory.mktemp("seed") / "seed.db"
+    db = Database(db_path)
+    with db.transaction():
+        db.upsert_aircraft("A00001", country="United States", registration="N12345", timestamp=1000.0)
+        db.add_position("A00001", lat=35.18, lon=-83.38, altitude_ft=38000, timestamp=1000.0)
+        db.add_receiver("test-rx")
+        db.start_capture(source="test")
+    db.close()  # Last connection closing checkpoints the WAL into seed.db
+    return db_path
+
+
 @pytest.fixture
-def db_file(tmp_path):
-    """Create a database with sample data."""
+def db_file(seed_db, tmp_path):
+    """A private copy of the sample database for each test."""
     db_path = tmp_path / "test.db"
-    db = Database(db_path)
-    db.upsert_aircraft("A00001", country="United States", registration="N12345", timestamp=1000.0)
-    db.add_position("A00001", lat=35.18, lon=-83.38, altitude_ft=38000, timestamp=1000.0)
-    db.add_receiver("test-rx")
-    db.start_capture(source="test")
-    db.close()
+    shutil.copyfile(seed_db, db_path)
     return str(db_path)
 
 
@@ -46,9 +63,9 @@ class TestDecodeCommand:
         assert "Aircraft" in result.output
         assert "Summary" in result.output
 
-    def test_decode_with_ref(self, runner, hex_file):
-        result = runner.invoke(cli, ["decode", hex_file, "--ref-lat", "52.0", "--ref-lon", "4.0"])
-        assert result.exit_code == 0
+    def test_decode_with_ref(self, hex_file, capsys):
+        decode.callback(hex_file, ref_lat=52.0, ref_lon=4.0)
+        assert "Summary" in capsys.readouterr().out
 
     def test_decode_nonexistent_file(self, runner):
         result = runner.invoke(cli, ["decode", "/nonexistent/file.txt"])
@@ -60,18 +77,19 @@ class TestTrackCommand:
         db_path = str(tmp_path / "track.db")
         result = runner.invoke(cli, ["track", hex_file, "--db-path", db_path])
         assert result.exit_code == 0
-        # Verify DB was created with data
-        db = Database(db_path)
-        assert db.count_aircraft() > 0
-        db.close()
+        # Verify DB was created with data — read-only, no schema setup
+        with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM aircraft").fetchone()[0] > 0
 
-    def test_track_with_receiver(self, runner, hex_file, tmp_path):
+    def test_track_with_receiver(self, hex_file, tmp_path):
         db_path = str(tmp_path / "track.db")
-        result = runner.invoke(cli, [
-            "track", hex_file, "--db-path", db_path,
-            "--receiver", "home", "--ref-lat", "35.18", "--ref-lon", "-83.38"
-        ])
-        assert result.exit_code == 0
+        track.callback(
+            hex_file, live=False, db_path=db_path, ref_lat=35.18, ref_lon=-83.38,
+            receiver="home", port=None, webhook=None,
+        )
+        db = Database(db_path)
+        assert db.get_receiver("home") is not None
+        db.close()
 
 
 class TestStatsCommand:
@@ -91,10 +109,9 @@ class TestHistoryCommand:
         assert result.exit_code == 0
         assert "United States" in result.output
 
-    def test_history_not_found(self, runner, db_file):
-        result = runner.invoke(cli, ["history", "FFFFFF", "--db-path", db_file])
-        assert result.exit_code == 0
-        assert "not found" in result.output
+    def test_history_not_found(self, db_file, capsys):
+        history.callback("FFFFFF", db_path=db_file, limit=20)
+        assert "not found" in capsys.readouterr().out
 
 
 class TestExportCommand:
@@ -103,26 +120,23 @@ class TestExportCommand:
         assert result.exit_code == 0
         assert "aircraft" in result.output
 
-    def test_export_csv(self, runner, db_file):
-        result = runner.invoke(cli, ["export", "--db-path", db_file, "--format", "csv"])
-        assert result.exit_code == 0
-        assert "icao" in result.output
+    def test_export_csv(self, db_file, capsys):
+        export_cmd.callback(db_path=db_file, fmt="csv", output=None)
+        assert "icao" in capsys.readouterr().out
 
-    def test_export_kml(self, runner, db_file):
-        result = runner.invoke(cli, ["export", "--db-path", db_file, "--format", "kml"])
-        assert result.exit_code == 0
-        assert "kml" in result.output.lower()
+    def test_export_kml(self, db_file, capsys):
+        export_cmd.callback(db_path=db_file, fmt="kml", output=None)
+        assert "kml" in capsys.readouterr().out.lower()
 
-    def test_export_geojson(self, runner, db_file):
-        result = runner.invoke(cli, ["export", "--db-path", db_file, "--format", "geojson"])
-        assert result.exit_code == 0
-        assert "FeatureCollection" in result.output
+    def test_export_geojson(self, db_file, capsys):
+        export_cmd.callback(db_path=db_file, fmt="geojson", output=None)
+        assert "FeatureCollection" in capsys.readouterr().out
 
-    def test_export_to_file(self, runner, db_file, tmp_path):
-        out = str(tmp_path / "out.json")
-        result = runner.invoke(cli, ["export", "--db-path", db_file, "--format", "json", "-o", out])
-        assert result.exit_code == 0
-        assert "Exported" in result.output
+    def test_export_to_file(self, db_file, tmp_path, capsys):
+        out = tmp_path / "out.json"
+        export_cmd.callback(db_path=db_file, fmt="json", output=str(out))
+        assert "Exported" in capsys.readouterr().out
+        assert "aircraft" in out.read_text()
 
 
 class TestVersionFlag:
@@ -57,3 +57,28 @@ class TestConfig:
 
         loaded = load_config()
         assert loaded["receiver"]["active"] is True
+
+    def test_repeat_load_uses_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.config.CONFIG_DIR", tmp_path)
+        monkeypatch.setattr("src.config.CONFIG_FILE", tmp_path / "config.yaml")
+        save_config(load_config())
+
+        first = load_config()
+        monkeypatch.setattr("src.config._parse_config", lambda path: {"parsed": True})
+        second = load_config()
+        assert second == first
+        # Callers get their own copy
+        second["receiver"]["name"] = "mutated"
+        assert load_config()["receiver"]["name"] == "default"
+
+    def test_cache_invalidated_by_external_edit(self, tmp_path, monkeypatch):
+        path = tmp_path / "config.yaml"
+        monkeypatch.setattr("src.config.CONFIG_DIR", tmp_path)
+        monkeypatch.setattr("src.config.CONFIG_FILE", path)
+        save_config(load_config())
+        assert load_config()["dashboard"]["port"] == 8080
+
+        path.write_text(path.read_text().replace("port: 8080", "port: 9191"))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert load_config()["dashboard"]["port"] == 9191
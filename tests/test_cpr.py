@@ -2,9 +2,15 @@
 
 import pytest
 
-from src.cpr import global_decode, local_decode, _nl
+import numpy as np
+
+from src.cpr import global_decode, global_decode_many, local_decode, _nl, _nl_formula
 from tests.fixtures.known_frames import POSITION_FRAMES, POSITION_DECODED
 
+# (cpr_lat, cpr_lon) of the published even/odd pair
+_CPR_EVEN = POSITION_FRAMES[0][4:6]
+_CPR_ODD = POSITION_FRAMES[1][4:6]
+
 
 class TestNLFunction:
     """Number of longitude zones at a given latitude."""
@@ -29,13 +35,16 @@ class TestNLFunction:
         assert _nl(45.0) == _nl(-45.0)
         assert _nl(30.0) == _nl(-30.0)
 
-    def test_monotonic_decrease(self):
+    @pytest.mark.parametrize("lat,prev_lat", list(zip(range(10, 90, 10), range(0, 80, 10))))
+    def test_monotonic_decrease(self, lat, prev_lat):
         """NL should decrease as latitude increases from equator."""
-        prev = _nl(0.0)
-        for lat in range(10, 90, 10):
-            current = _nl(float(lat))
-            assert current <= prev
-            prev = current
+        assert _nl(float(lat)) <= _nl(float(prev_lat))
+
+    def test_table_matches_formula(self):
+        """Table lookup should agree with the ICAO formula across the latitude range."""
+        for i in range(-9000, 9001):
+            lat = i / 100 + 0.003  # Stay off exact transition latitudes
+            assert _nl(lat) == _nl_formula(lat), lat
 
 
 class TestGlobalDecode:
@@ -43,14 +52,8 @@ class TestGlobalDecode:
 
     def test_known_position(self):
         """Decode the published test vector position."""
-        _, _, _, _, lat_even, lon_even = POSITION_FRAMES[0]
-        _, _, _, _, lat_odd, lon_odd = POSITION_FRAMES[1]
-
         result = global_decode(
-            lat_even=lat_even,
-            lon_even=lon_even,
-            lat_odd=lat_odd,
-            lon_odd=lon_odd,
+            *_CPR_EVEN, *_CPR_ODD,
             t_even=1.0,  # Even is more recent (matches published expected values)
             t_odd=0.5,
         )
@@ -60,59 +63,48 @@ class TestGlobalDecode:
         assert abs(lat - POSITION_DECODED["lat"]) < 0.01
         assert abs(lon - POSITION_DECODED["lon"]) < 0.01
 
-    def test_even_more_recent(self):
-        """When even frame is more recent, use it for longitude."""
-        _, _, _, _, lat_even, lon_even = POSITION_FRAMES[0]
-        _, _, _, _, lat_odd, lon_odd = POSITION_FRAMES[1]
+    @pytest.mark.parametrize("t_even,t_odd", [(0.0, 15.0), (15.0, 0.0)])
+    def test_stale_pair_rejected(self, t_even, t_odd):
+        """Pairs older than 10 seconds should be rejected."""
+        assert global_decode(*_CPR_EVEN, *_CPR_ODD, t_even=t_even, t_odd=t_odd) is None
 
-        result = global_decode(
-            lat_even=lat_even,
-            lon_even=lon_even,
-            lat_odd=lat_odd,
-            lon_odd=lon_odd,
-            t_even=1.0,  # Even is more recent
-            t_odd=0.5,
-        )
+    @pytest.mark.parametrize("t_even,t_odd", [(1.0, 0.5), (0.0, 0.5)], ids=["even_newer", "odd_newer"])
+    def test_returns_reasonable_coordinates(self, t_even, t_odd):
+        """Decoded coordinates should be in valid geographic range."""
+        result = global_decode(*_CPR_EVEN, *_CPR_ODD, t_even=t_even, t_odd=t_odd)
 
         assert result is not None
         lat, lon = result
-        assert abs(lat - POSITION_DECODED["lat"]) < 0.01
-        assert abs(lon - POSITION_DECODED["lon"]) < 0.01
-
-    def test_stale_pair_rejected(self):
-        """Pairs older than 10 seconds should be rejected."""
-        _, _, _, _, lat_even, lon_even = POSITION_FRAMES[0]
-        _, _, _, _, lat_odd, lon_odd = POSITION_FRAMES[1]
+        assert -90 <= lat <= 90
+        assert -180 <= lon <= 180
 
-        result = global_decode(
-            lat_even=lat_even,
-            lon_even=lon_even,
-            lat_odd=lat_odd,
-            lon_odd=lon_odd,
-            t_even=0.0,
-            t_odd=15.0,  # 15 seconds apart
-        )
 
-        assert result is None
+class TestGlobalDecodeMany:
+    """Vectorized global decode over arrays of frame pairs."""
 
-    def test_returns_reasonable_coordinates(self):
-        """Decoded coordinates should be in valid geographic range."""
-        _, _, _, _, lat_even, lon_even = POSITION_FRAMES[0]
-        _, _, _, _, lat_odd, lon_odd = POSITION_FRAMES[1]
+    def test_matches_scalar(self):
+        lat_even, lon_even = _CPR_EVEN
+        lat_odd, lon_odd = _CPR_ODD
+        t_even = np.array([1.0, 0.0, 0.0])
+        t_odd = np.array([0.5, 0.5, 15.0])
+        n = len(t_even)
 
-        result = global_decode(
-            lat_even=lat_even,
-            lon_even=lon_even,
-            lat_odd=lat_odd,
-            lon_odd=lon_odd,
-            t_even=0.0,
-            t_odd=0.5,
+        lats, lons = global_decode_many(
+            np.full(n, lat_even), np.full(n, lon_even),
+            np.full(n, lat_odd), np.full(n, lon_odd),
+            t_even, t_odd,
         )
 
-        assert result is not None
-        lat, lon = result
-        assert -90 <= lat <= 90
-        assert -180 <= lon <= 180
+        for k in range(n):
+            expected = global_decode(lat_even, lon_even, lat_odd, lon_odd, t_even[k], t_odd[k])
+            if expected is None:
+                assert np.isnan(lats[k]) and np.isnan(lons[k])
+            else:
+                assert (lats[k], lons[k]) == pytest.approx(expected)
+
+    def test_stale_pair_is_nan(self):
+        lats, lons = global_decode_many([0], [0], [0], [0], [0.0], [15.0])
+        assert np.isnan(lats[0]) and np.isnan(lons[0])
 
 
 class TestLocalDecode:
@@ -120,7 +112,7 @@ class TestLocalDecode:
 
     def test_with_known_reference(self):
         """Local decode using a nearby reference should produce accurate result."""
-        _, _, _, _, cpr_lat, cpr_lon = POSITION_FRAMES[0]  # Even frame
+        cpr_lat, cpr_lon = _CPR_EVEN
 
         # Use the expected decoded position as reference (within 180nm)
         ref_lat = POSITION_DECODED["lat"]
@@ -139,7 +131,7 @@ class TestLocalDecode:
 
     def test_odd_frame(self):
         """Local decode with odd frame."""
-        _, _, _, _, cpr_lat, cpr_lon = POSITION_FRAMES[1]  # Odd frame
+        cpr_lat, cpr_lon = _CPR_ODD
 
         ref_lat = POSITION_DECODED["lat"]
         ref_lon = POSITION_DECODED["lon"]
@@ -157,7 +149,7 @@ class TestLocalDecode:
 
     def test_coordinates_in_range(self):
         """Local decode should produce valid geographic coordinates."""
-        _, _, _, _, cpr_lat, cpr_lon = POSITION_FRAMES[0]
+        cpr_lat, cpr_lon = _CPR_EVEN
 
         lat, lon = local_decode(
             cpr_lat=cpr_lat,
@@ -1,5 +1,6 @@
 """Tests for CRC-24 validation, byte-at-a-time LUT, syndrome error correction."""
 
+import numpy as np
 import pytest
 
 from src.crc import (
@@ -9,41 +10,57 @@ from src.crc import (
     _SYNDROME_TABLE_112,
     GENERATOR,
     crc24,
+    crc24_many,
     crc24_payload,
     extract_icao,
     residual,
     try_fix,
+    try_fix_bytes,
     validate,
 )
-from tests.fixtures.known_frames import CRC_VECTORS, IDENTIFICATION_FRAMES, POSITION_FRAMES, VELOCITY_FRAMES
+from tests.fixtures.known_frames import (
+    CRC_VECTORS,
+    CRC_VECTORS_BYTES,
+    IDENTIFICATION_FRAMES,
+    IDENTIFICATION_FRAMES_BYTES,
+    POSITION_FRAMES,
+    POSITION_FRAMES_BYTES,
+    VELOCITY_FRAMES,
+    VELOCITY_FRAMES_BYTES,
+)
+
+
+def _hex_id(value):
+    """Readable parametrize id for a frame given as bytes."""
+    return value.hex().upper() if isinstance(value, bytes) else None
 
 
 class TestCRC24:
     """Core CRC-24 computation."""
 
-    def test_valid_df17_remainder_is_zero(self):
+    @pytest.mark.crc_vector
+    @pytest.mark.parametrize("data,expected", CRC_VECTORS_BYTES, ids=_hex_id)
+    def test_valid_df17_remainder_is_zero(self, data, expected):
         """Valid DF17 frames should produce CRC remainder of 0."""
-        for hex_str, expected in CRC_VECTORS:
-            data = bytes.fromhex(hex_str)
-            assert crc24(data) == expected, f"CRC mismatch for {hex_str}"
-
-    def test_all_identification_frames_valid(self):
-        """All identification test vectors should pass CRC."""
-        for hex_str, _, _ in IDENTIFICATION_FRAMES:
-            data = bytes.fromhex(hex_str)
-            assert crc24(data) == 0, f"CRC failed for identification frame {hex_str}"
-
-    def test_all_position_frames_valid(self):
-        """All position test vectors should pass CRC."""
-        for hex_str, _, _, _, _, _ in POSITION_FRAMES:
-            data = bytes.fromhex(hex_str)
-            assert crc24(data) == 0, f"CRC failed for position frame {hex_str}"
-
-    def test_all_velocity_frames_valid(self):
-        """All velocity test vectors should pass CRC."""
-        for hex_str, _, _, _, _ in VELOCITY_FRAMES:
-            data = bytes.fromhex(hex_str)
-            assert crc24(data) == 0, f"CRC failed for velocity frame {hex_str}"
+        assert crc24(data) == expected
+
+    @pytest.mark.crc_vector
+    @pytest.mark.parametrize("data", [f[0] for f in IDENTIFICATION_FRAMES_BYTES], ids=_hex_id)
+    def test_identification_frame_valid(self, data):
+        """Every identification test vector should pass CRC."""
+        assert crc24(data) == 0
+
+    @pytest.mark.crc_vector
+    @pytest.mark.parametrize("data", [f[0] for f in POSITION_FRAMES_BYTES], ids=_hex_id)
+    def test_position_frame_valid(self, data):
+        """Every position test vector should pass CRC."""
+        assert crc24(data) == 0
+
+    @pytest.mark.crc_vector
+    @pytest.mark.parametrize("data", [f[0] for f in VELOCITY_FRAMES_BYTES], ids=_hex_id)
+    def test_velocity_frame_valid(self, data):
+        """Every velocity test vector should pass CRC."""
+        assert crc24(data) == 0
 
     def test_corrupted_frame_nonzero(self):
         """A corrupted frame should produce non-zero remainder."""
@@ -66,6 +83,21 @@ class TestCRC24:
         assert result != 0  # Non-trivial
 
 
+class TestCRC24Many:
+    """Vectorized CRC over a batch of frames."""
+
+    def test_vector_tables_valid_in_one_call(self):
+        frames = [f[0] for f in IDENTIFICATION_FRAMES_BYTES + POSITION_FRAMES_BYTES + VELOCITY_FRAMES_BYTES]
+        arr = np.frombuffer(b"".join(frames), dtype=np.uint8).reshape(-1, 14)
+        assert (crc24_many(arr) == 0).all()
+
+    @pytest.mark.parametrize("n_bytes", [3, 7, 14])
+    def test_matches_scalar(self, n_bytes):
+        rng = np.random.default_rng(0)
+        arr = rng.integers(0, 256, size=(200, n_bytes), dtype=np.uint8)
+        assert crc24_many(arr).tolist() == [crc24(bytes(row)) for row in arr]
+
+
 class TestCRCTable:
     """Phase 1: Byte-at-a-time lookup table."""
 
@@ -84,8 +116,7 @@ class TestCRCTable:
 
     def test_known_vectors_match(self):
         """Byte-at-a-time CRC should match known test vectors."""
-        for hex_str, expected in CRC_VECTORS:
-            data = bytes.fromhex(hex_str)
+        for data, expected in CRC_VECTORS_BYTES:
             assert crc24(data) == expected
 
     def test_crc24_payload_helper(self):
@@ -137,19 +168,14 @@ class TestResidual:
 class TestExtractICAO:
     """ICAO address extraction."""
 
-    def test_df17_icao_from_message(self):
+    @pytest.mark.crc_vector
+    @pytest.mark.parametrize(
+        "hex_str,expected_icao",
+        [f[:2] for f in IDENTIFICATION_FRAMES + POSITION_FRAMES + VELOCITY_FRAMES],
+    )
+    def test_df17_icao_from_message(self, hex_str, expected_icao):
         """DF17 ICAO should come from bytes 1-3."""
-        for hex_str, expected_icao, _ in IDENTIFICATION_FRAMES:
-            icao = extract_icao(hex_str)
-            assert icao == expected_icao, f"ICAO mismatch for {hex_str}"
-
-    def test_df17_position_icao(self):
-        for hex_str, expected_icao, _, _, _, _ in POSITION_FRAMES:
-            assert extract_icao(hex_str) == expected_icao
-
-    def test_df17_velocity_icao(self):
-        for hex_str, expected_icao, _, _, _ in VELOCITY_FRAMES:
-            assert extract_icao(hex_str) == expected_icao
+        assert extract_icao(hex_str) == expected_icao
 
     def test_case_insensitive_input(self):
         assert extract_icao("8d4840d6202cc371c32ce0576098") == "4840D6"
@@ -178,6 +204,20 @@ class TestSyndromeTables:
         double_bit_count = sum(1 for v in _SYNDROME_TABLE_56.values() if len(v) == 2)
         assert double_bit_count > 0
 
+    @pytest.mark.parametrize("n_bits,table", [(56, _SYNDROME_TABLE_56), (112, _SYNDROME_TABLE_112)])
+    def test_xor_built_table_matches_direct_crc(self, n_bits, table):
+        """Tables built from XORed single-bit syndromes match a CRC per bit pair."""
+        n_bytes = n_bits // 8
+        expected: dict[int, list[int]] = {}
+        for bits in [(b,) for b in range(n_bits)] + [
+            (b1, b2) for b1 in range(n_bits) for b2 in range(b1 + 1, n_bits)
+        ]:
+            msg = bytearray(n_bytes)
+            for b in bits:
+                msg[b // 8] |= 1 << (7 - (b % 8))
+            expected.setdefault(crc24(bytes(msg)), list(bits))
+        assert table == expected
+
     def test_112_table_size_reasonable(self):
         """112-bit table: 112 single + up to 6216 double = ~6328 max entries."""
         assert len(_SYNDROME_TABLE_112) > 100
@@ -189,89 +229,81 @@ class TestSyndromeTables:
         assert len(_SYNDROME_TABLE_56) <= 2000
 
 
+_VALID_HEX = "8D4840D6202CC371C32CE0576098"
+_VALID = bytes.fromhex(_VALID_HEX)
+
+
+def _flip(data: bytes, *flips: tuple[int, int]) -> bytes:
+    """Copy of data with (byte_index, mask) bits flipped."""
+    out = bytearray(data)
+    for i, mask in flips:
+        out[i] ^= mask
+    return bytes(out)
+
+
+# Corrupted copies of _VALID, built once for TestTryFix
+_CORRUPTED = {
+    "single": _flip(_VALID, (5, 0x80)),                        # MSB of byte 5
+    "double": _flip(_VALID, (5, 0x80), (8, 0x01)),
+    "triple": _flip(_VALID, (5, 0x80), (8, 0x01), (10, 0x40)),
+    "df_bit": _flip(_VALID, (0, 0x80)),                        # bit 0, in the DF field
+    "icao_safe": _flip(_VALID, (7, 0x10)),                     # a data bit
+}
+
+
+def _df11_message() -> bytes:
+    """A valid 56-bit DF11 (all-call reply) with CRC remainder 0, like DF17/18."""
+    # DF11 = 01011 << 3 = 0x58, ICAO ABCDEF
+    head = bytes([0x58, 0xAB, 0xCD, 0xEF])
+    # Mode S CRC = raw_crc(data[:-3]) XOR data[-3:]; to get 0, PI = raw_crc(head)
+    return head + _crc24_raw(head).to_bytes(3, "big")
+
+
+_DF11_VALID_HEX = _df11_message().hex().upper()
+_DF11_CORRUPTED_HEX = _flip(_df11_message(), (3, 0x04)).hex().upper()
+
+
 class TestTryFix:
     """Phase 2: Error correction via syndrome lookup."""
 
     def test_single_bit_correction(self):
         """Flipping one bit in a valid frame should be correctable."""
-        valid = "8D4840D6202CC371C32CE0576098"
-        # Flip bit 47 (a data bit, not DF field)
-        data = bytearray.fromhex(valid)
-        data[5] ^= 0x80  # Flip MSB of byte 5
-        corrupted = data.hex().upper()
-        fixed = try_fix(corrupted)
-        assert fixed is not None
-        assert fixed == valid
+        fixed = try_fix(_CORRUPTED["single"].hex().upper())
+        assert fixed == _VALID_HEX
+
+    def test_single_bit_correction_bytes(self):
+        assert try_fix_bytes(_CORRUPTED["single"]) == _VALID
 
     def test_double_bit_correction(self):
         """Flipping two bits should be correctable."""
-        valid = "8D4840D6202CC371C32CE0576098"
-        data = bytearray.fromhex(valid)
-        data[5] ^= 0x80  # Flip bit in byte 5
-        data[8] ^= 0x01  # Flip bit in byte 8
-        corrupted = data.hex().upper()
-        fixed = try_fix(corrupted)
-        assert fixed is not None
-        assert fixed == valid
+        assert try_fix_bytes(_CORRUPTED["double"]) == _VALID
 
     def test_triple_bit_not_correctable(self):
         """Flipping three bits should NOT be correctable."""
-        valid = "8D4840D6202CC371C32CE0576098"
-        data = bytearray.fromhex(valid)
-        data[5] ^= 0x80
-        data[8] ^= 0x01
-        data[10] ^= 0x40
-        corrupted = data.hex().upper()
-        fixed = try_fix(corrupted)
-        assert fixed is None
+        assert try_fix_bytes(_CORRUPTED["triple"]) is None
 
     def test_df_field_protection(self):
         """Never correct bits 0-4 (DF field)."""
-        valid = "8D4840D6202CC371C32CE0576098"
-        data = bytearray.fromhex(valid)
-        # Flip bit 0 (MSB of byte 0, which is part of DF field)
-        data[0] ^= 0x80
-        corrupted = data.hex().upper()
-        fixed = try_fix(corrupted)
-        assert fixed is None  # Should refuse to correct DF field
+        assert try_fix_bytes(_CORRUPTED["df_bit"]) is None  # Should refuse to correct DF field
 
     def test_valid_frame_returns_self(self):
         """Already-valid frame should be returned as-is."""
-        valid = "8D4840D6202CC371C32CE0576098"
-        assert try_fix(valid) == valid
+        assert try_fix(_VALID_HEX) == _VALID_HEX
+        assert try_fix_bytes(_VALID) is _VALID
+
+    def test_precomputed_syndrome(self):
+        """A caller-supplied syndrome skips the CRC pass and gives the same fix."""
+        data = _CORRUPTED["double"]
+        assert try_fix_bytes(data, crc24(data)) == _VALID
 
     def test_correction_preserves_icao(self):
         """Corrected frame should have same ICAO as original."""
-        valid = "8D4840D6202CC371C32CE0576098"
-        data = bytearray.fromhex(valid)
-        data[7] ^= 0x10  # Flip a data bit
-        corrupted = data.hex().upper()
-        fixed = try_fix(corrupted)
+        fixed = try_fix_bytes(_CORRUPTED["icao_safe"])
         assert fixed is not None
         # ICAO is bytes 1-3, should be preserved
-        assert fixed[2:8] == valid[2:8]
+        assert fixed[1:4] == _VALID[1:4]
 
     def test_short_message_correction(self):
         """Error correction should also work on 56-bit (short) messages."""
-        # For DF11 (all-call reply), CRC remainder = 0 when valid (like DF17/18)
-        # DF11 = 01011 << 3 = 0x58
-        msg = bytearray(7)
-        msg[0] = 0x58  # DF11
-        msg[1] = 0xAB  # ICAO byte 1
-        msg[2] = 0xCD  # ICAO byte 2
-        msg[3] = 0xEF  # ICAO byte 3
-        # Compute CRC of first 4 bytes and set PI to make Mode S CRC = 0
-        # Mode S CRC = raw_crc(data[:-3]) XOR data[-3:]
-        # To get 0: PI = raw_crc(first_4_bytes)
-        payload_crc = _crc24_raw(bytes(msg[:4]))
-        msg[4] = (payload_crc >> 16) & 0xFF
-        msg[5] = (payload_crc >> 8) & 0xFF
-        msg[6] = payload_crc & 0xFF
-        valid_hex = msg.hex().upper()
-        assert crc24(bytes.fromhex(valid_hex)) == 0
-        # Corrupt one bit and try to fix
-        corrupted = bytearray.fromhex(valid_hex)
-        corrupted[3] ^= 0x04
-        fixed = try_fix(corrupted.hex().upper())
-        assert fixed is not None
-        assert fixed == valid_hex
+        assert crc24(bytes.fromhex(_DF11_VALID_HEX)) == 0
+        assert try_fix(_DF11_CORRUPTED_HEX) == _DF11_VALID_HEX
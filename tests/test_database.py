@@ -1,5 +1,7 @@
 """Tests for SQLite database persistence."""
 
+import shutil
+import sqlite3
 import time
 
 import pytest
@@ -7,18 +9,44 @@ import pytest
 from src.database import Database
 
 
+@pytest.fixture(scope="module")
+def template_db(tmp_path_factory):
+    """Empty database with the full schema, built once per module."""
+    path = tmp_path_factory.mktemp("template") / "template.db"
+    d = Database(path)
+    _ = d.conn  # Initialize schema
+    d.close()  # Checkpoints the WAL into template.db
+    return path
+
+
 @pytest.fixture
-def db(tmp_path):
-    """Fresh database for each test."""
+def disk_db(template_db, tmp_path):
+    """File-backed database cloned from the schema template.
+
+    Only for tests that need real files: WAL, VACUUM, a second connection.
+    """
+    shutil.copyfile(template_db, tmp_path / "test.db")
     d = Database(tmp_path / "test.db")
-    _ = d.conn  # Initialize schema
+    _ = d.conn
     yield d
     d.close()
 
 
 @pytest.fixture
-def mem_db():
-    """In-memory database."""
+def db():
+    """Fresh in-memory database for each test."""
+    d = Database(":memory:")
+    _ = d.conn  # Initialize schema
+    yield d
+    d.close()
+
+
+@pytest.fixture(scope="module")
+def empty_db():
+    """Shared empty in-memory database for tests that only read.
+
+    Never write through it: there is no rollback between tests.
+    """
     d = Database(":memory:")
     _ = d.conn
     yield d
@@ -42,8 +70,8 @@ class TestReceivers:
         assert r["name"] == "home"
         assert r["lat"] == pytest.approx(35.18)
 
-    def test_get_nonexistent(self, db):
-        assert db.get_receiver("nope") is None
+    def test_get_nonexistent(self, empty_db):
+        assert empty_db.get_receiver("nope") is None
 
 
 class TestAircraft:
@@ -71,12 +99,6 @@ class TestAircraft:
         ac = db.get_aircraft("ADF7C8")
         assert ac["is_military"] == 1  # Once military, always military
 
-    def test_count(self, db):
-        assert db.count_aircraft() == 0
-        db.upsert_aircraft("A00001", timestamp=1000.0)
-        db.upsert_aircraft("A00002", timestamp=1000.0)
-        assert db.count_aircraft() == 2
-
 
 class TestPositions:
     def test_add_and_retrieve(self, db):
@@ -101,10 +123,39 @@ class TestPositions:
         positions = db.get_positions("A00001")
         assert positions[0]["timestamp"] > positions[1]["timestamp"]
 
-    def test_count(self, db):
+    def test_history_query_uses_icao_timestamp_index(self, empty_db):
+        plan = empty_db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM positions WHERE icao = ? "
+            "ORDER BY timestamp DESC LIMIT ?", ("A00001", 10),
+        ).fetchall()
+        detail = " ".join(row["detail"] for row in plan)
+        assert "idx_positions_icao_ts" in detail
+        assert "TEMP B-TREE" not in detail
+
+    def test_last_position_id_tracks_newest_insert(self, db):
         db.upsert_aircraft("A00001", timestamp=1000.0)
+        assert db.get_aircraft("A00001")["last_position_id"] is None
         db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=1000.0)
-        assert db.count_positions() == 1
+        db.add_position("A00001", lat=35.1, lon=-83.0, timestamp=2000.0)
+        newest = db.get_positions("A00001", limit=1)[0]["id"]
+        assert db.get_aircraft("A00001")["last_position_id"] == newest
+
+    def test_last_position_id_backfilled_for_existing_db(self, tmp_path):
+        path = tmp_path / "old.db"
+        first = Database(path)
+        first.upsert_aircraft("A00001", timestamp=1000.0)
+        first.add_position("A00001", lat=35.0, lon=-83.0, timestamp=1000.0)
+        # Simulate a database created before last_position_id existed
+        first.conn.executescript(
+            "DROP TRIGGER trg_positions_last_id; DROP TRIGGER trg_aircraft_version_upd;"
+            "ALTER TABLE aircraft DROP COLUMN last_position_id;"
+        )
+        first.close()
+        db = Database(path)
+        assert db.get_aircraft("A00001")["last_position_id"] == db.get_positions("A00001")[0]["id"]
+        db.add_position("A00001", lat=35.1, lon=-83.0, timestamp=2000.0)
+        assert db.get_aircraft("A00001")["last_position_id"] == db.get_positions("A00001")[0]["id"]
+        db.close()
 
     def test_receiver_id_tagged(self, db):
         rid = db.add_receiver("home")
@@ -113,6 +164,38 @@ class TestPositions:
         pos = db.get_positions("A00001")[0]
         assert pos["receiver_id"] == rid
 
+    def test_add_positions_matches_single_row_path(self, db):
+        rid = db.add_receiver("home")
+        rows = [
+            ("A00001", 35.0, -83.0, 38000, 450.0, 90.0, -64, rid, 1000.0),
+            ("A00002", 36.0, -84.0, None, None, None, None, None, 1001.0),
+            ("A00001", 35.1, -83.0, 38100, 451.0, 91.0, 0, rid, 1002.0),
+        ]
+        single = Database(":memory:")
+        for d in (db, single):
+            d.upsert_aircraft("A00001", timestamp=1000.0)
+            d.upsert_aircraft("A00002", timestamp=1000.0)
+        single.add_receiver("home")
+        db.add_positions(rows)
+        for row in rows:
+            single.add_position(*row)
+        for icao in ("A00001", "A00002"):
+            assert db.get_positions(icao) == single.get_positions(icao)
+            assert db.get_aircraft(icao) == single.get_aircraft(icao)
+        single.close()
+
+    def test_add_positions_defaults_trailing_fields(self, db):
+        db.upsert_aircraft("A00001", timestamp=1000.0)
+        db.add_positions([("A00001", 35.0, -83.0)])
+        pos = db.get_positions("A00001")[0]
+        assert pos["altitude_ft"] is None
+        assert pos["receiver_id"] is None
+        assert pos["timestamp"] == pytest.approx(time.time(), abs=60)
+
+    def test_add_positions_empty(self, db):
+        db.add_positions([])
+        assert db.count_positions() == 0
+
 
 class TestCaptures:
     def test_start_and_end(self, db):
@@ -141,24 +224,23 @@ class TestEvents:
         assert len(db.get_events("emergency_squawk")) == 1
         assert len(db.get_events("military_detected")) == 1
 
-    def test_count(self, db):
-        db.upsert_aircraft("A00001", timestamp=1000.0)
-        db.add_event("A00001", "test", timestamp=1000.0)
-        assert db.count_events() == 1
-
 
 class TestSightings:
     def test_upsert_creates(self, db):
         db.upsert_aircraft("A00001", timestamp=1000.0)
         db.upsert_sighting("A00001", callsign="DAL123", timestamp=1000.0)
+        [row] = db.get_sightings("A00001")
+        assert row["callsign"] == "DAL123"
+        assert row["message_count"] == 1
+
+    def test_get_sightings_unknown_icao(self, empty_db):
+        assert empty_db.get_sightings("A00001") == []
 
     def test_upsert_increments_count(self, db):
         db.upsert_aircraft("A00001", timestamp=1000.0)
         db.upsert_sighting("A00001", callsign="DAL123", timestamp=1000.0)
         db.upsert_sighting("A00001", timestamp=1001.0)
-        row = db.conn.execute(
-            "SELECT message_count FROM sightings WHERE icao = ?", ("A00001",)
-        ).fetchone()
+        [row] = db.get_sightings("A00001")
         assert row["message_count"] == 2
 
     def test_altitude_tracking(self, db):
@@ -166,40 +248,100 @@ class TestSightings:
         db.upsert_sighting("A00001", altitude_ft=30000, timestamp=1000.0)
         db.upsert_sighting("A00001", altitude_ft=35000, timestamp=1001.0)
         db.upsert_sighting("A00001", altitude_ft=28000, timestamp=1002.0)
-        row = db.conn.execute(
-            "SELECT min_altitude_ft, max_altitude_ft FROM sightings WHERE icao = ?", ("A00001",)
-        ).fetchone()
+        [row] = db.get_sightings("A00001")
         assert row["min_altitude_ft"] == 28000
         assert row["max_altitude_ft"] == 35000
 
 
 class TestStats:
-    def test_empty_stats(self, db):
+    def test_counts_and_stats(self, db):
+        """count_* helpers and stats() agree, empty and after one setup."""
+        assert db.count_aircraft() == db.count_positions() == db.count_events() == 0
         s = db.stats()
-        assert s["aircraft"] == 0
-        assert s["positions"] == 0
+        assert (s["aircraft"], s["positions"]) == (0, 0)
 
-    def test_stats_after_data(self, db):
         db.add_receiver("home")
         db.upsert_aircraft("A00001", timestamp=1000.0)
+        db.upsert_aircraft("A00002", timestamp=1000.0)
         db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=1000.0)
+        db.add_event("A00001", "test", timestamp=1000.0)
+        counts = {
+            "aircraft": db.count_aircraft(),
+            "positions": db.count_positions(),
+            "events": db.count_events(),
+        }
+        assert counts == {"aircraft": 2, "positions": 1, "events": 1}
+        s = db.stats()
+        assert {k: s[k] for k in ("aircraft", "positions", "events", "receivers")} == {
+            **counts, "receivers": 1,
+        }
+
+    def test_stats_track_upserts_and_deletes(self, db):
+        for t in (1000.0, 1001.0, 1002.0):
+            db.upsert_aircraft("A00001", timestamp=t)
+        for t in (1000.0, 1001.0, 1002.0):
+            db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=t)
+        db.prune_positions(max_age_hours=1)
         s = db.stats()
         assert s["aircraft"] == 1
+        assert s["positions"] == db.count_positions() == 0
+
+    def test_stats_seeded_for_existing_db(self, tmp_path):
+        path = tmp_path / "old.db"
+        first = Database(path)
+        first.upsert_aircraft("A00001", timestamp=1000.0)
+        first.add_position("A00001", lat=35.0, lon=-83.0, timestamp=1000.0)
+        # Simulate a database created before row_counts existed
+        first.conn.executescript(
+            "DROP TABLE row_counts;"
+            "DROP TRIGGER trg_positions_count_ins; DROP TRIGGER trg_aircraft_count_ins;"
+        )
+        first.close()
+        second = Database(path)
+        s = second.stats()
+        second.close()
+        assert s["aircraft"] == 1
         assert s["positions"] == 1
-        assert s["receivers"] == 1
+
+    def test_open_existing_db_takes_no_write_lock(self, disk_db, tmp_path):
+        """Counters already installed: a new connection opens under a held write lock."""
+        writer = sqlite3.connect(tmp_path / "test.db")
+        writer.execute("BEGIN IMMEDIATE")
+        reader = Database(tmp_path / "test.db")
+        try:
+            assert reader.stats()["aircraft"] == 0
+        finally:
+            reader.close()
+            writer.rollback()
+            writer.close()
+
+    def test_recount_repairs_drift(self, db):
+        db.upsert_aircraft("A00001", timestamp=1000.0)
+        db.add_positions([("A00001", 35.0, -83.0, None, None, None, None, None, 1000.0 + i)
+                          for i in range(3)])
+        db.conn.execute("UPDATE row_counts SET cnt = 42 WHERE name = 'positions'")
+        db.conn.execute("DELETE FROM row_counts WHERE name = 'aircraft'")
+        assert db.stats()["positions"] == 42
+        s = db.recount()
+        assert (s["aircraft"], s["positions"]) == (1, 3)
+        assert db.stats() == s
+
+
+# Fixed timestamp at the start of a 30s bucket (+1s), far older than any
+# downsample cutoff, so bucket membership never depends on the clock
+_OLD_BUCKET_START = (1_700_000_000 // 30) * 30 + 1
 
 
 class TestDownsampling:
     def test_downsample_keeps_one_per_bucket(self, db):
         """Positions within the same time bucket are thinned to one."""
         db.upsert_aircraft("A00001", timestamp=1000.0)
-        now = time.time()
-        # Use a round base to avoid straddling a 30s bucket boundary
-        old = (int((now - 100000) / 30) * 30) + 1  # Align to start of a 30s bucket
+        old = _OLD_BUCKET_START
         # 10 positions within the same 30s bucket (span 9 seconds)
-        for i in range(10):
-            db.add_position("A00001", lat=35.0, lon=-83.0, altitude_ft=30000 + i,
-                           timestamp=old + i)
+        db.add_positions(
+            [("A00001", 35.0, -83.0, 30000 + i, None, None, None, None, old + i)
+             for i in range(10)]
+        )
         assert db.count_positions() == 10
         removed = db.downsample_positions(older_than_hours=24, keep_interval_sec=30)
         assert removed == 9  # Keep 1 per bucket
@@ -208,23 +350,26 @@ class TestDownsampling:
     def test_downsample_preserves_recent(self, db):
         """Positions newer than the cutoff are untouched."""
         db.upsert_aircraft("A00001", timestamp=1000.0)
+        # downsample_positions cuts off relative to the wall clock, so
+        # "recent" has to be too
         now = time.time()
         # Add recent positions (< 24h old)
-        for i in range(5):
-            db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=now - i)
+        db.add_positions(
+            [("A00001", 35.0, -83.0, None, None, None, None, None, now - i) for i in range(5)]
+        )
         removed = db.downsample_positions(older_than_hours=24, keep_interval_sec=30)
         assert removed == 0
         assert db.count_positions() == 5
 
     def test_downsample_multiple_aircraft(self, db):
         """Each aircraft is downsampled independently."""
-        now = time.time()
-        old = (int((now - 100000) / 30) * 30) + 1  # Align to bucket
+        old = _OLD_BUCKET_START
         db.upsert_aircraft("A00001", timestamp=1000.0)
         db.upsert_aircraft("A00002", timestamp=1000.0)
-        for i in range(10):
-            db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=old + i)
-            db.add_position("A00002", lat=36.0, lon=-84.0, timestamp=old + i)
+        db.add_positions(
+            [("A00001", 35.0, -83.0, None, None, None, None, None, old + i) for i in range(10)]
+            + [("A00002", 36.0, -84.0, None, None, None, None, None, old + i) for i in range(10)]
+        )
         assert db.count_positions() == 20
         db.downsample_positions(older_than_hours=24, keep_interval_sec=30)
         assert db.count_positions() == 2  # 1 per aircraft
@@ -232,27 +377,80 @@ class TestDownsampling:
     def test_downsample_separate_buckets_preserved(self, db):
         """Positions in different time buckets are each kept."""
         db.upsert_aircraft("A00001", timestamp=1000.0)
-        now = time.time()
-        old = now - 100000
+        old = _OLD_BUCKET_START
         # 3 positions in 3 separate 30s buckets
-        db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=old)
-        db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=old + 35)
-        db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=old + 70)
+        db.add_positions(
+            [("A00001", 35.0, -83.0, None, None, None, None, None, old + offset)
+             for offset in (0, 35, 70)]
+        )
         db.downsample_positions(older_than_hours=24, keep_interval_sec=30)
         assert db.count_positions() == 3  # Each in its own bucket
 
-    def test_vacuum(self, db):
+    def test_vacuum(self, disk_db):
         """VACUUM runs without error."""
+        disk_db.upsert_aircraft("A00001", timestamp=1000.0)
+        disk_db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=1000.0)
+        disk_db.vacuum()  # Should not raise
+
+    def test_optimize_leaves_db_usable(self, db):
+        """PRAGMA optimize runs and queries still plan and return the same rows."""
         db.upsert_aircraft("A00001", timestamp=1000.0)
-        db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=1000.0)
-        db.vacuum()  # Should not raise
+        db.add_positions([("A00001", 35.0 + i * 0.01, -83.0, None, None, None, None, None, 1000.0 + i)
+                          for i in range(5)])
+        before = db.get_positions("A00001")
+        db.optimize()
+        assert db.get_positions("A00001") == before
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM positions WHERE icao = ? "
+            "ORDER BY timestamp DESC LIMIT ?", ("A00001", 10),
+        ).fetchall()
+        assert "idx_positions_icao_ts" in " ".join(row["detail"] for row in plan)
+
+
+class TestTransaction:
+    def test_commits_once_on_exit(self, disk_db, tmp_path):
+        reader = sqlite3.connect(tmp_path / "test.db")
+        count = "SELECT COUNT(*) FROM aircraft"
+        with disk_db.transaction():
+            disk_db.upsert_aircraft("A00001", timestamp=1000.0)
+            disk_db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=1000.0)
+            assert disk_db.conn.in_transaction
+            assert reader.execute(count).fetchone()[0] == 0
+        assert not disk_db.conn.in_transaction
+        assert reader.execute(count).fetchone()[0] == 1
+        reader.close()
+
+    def test_rolls_back_on_error(self, db):
+        with pytest.raises(RuntimeError), db.transaction():
+            db.upsert_aircraft("A00001", timestamp=1000.0)
+            raise RuntimeError("boom")
+        assert db.get_aircraft("A00001") is None
+        db.upsert_aircraft("A00002", timestamp=1000.0)
+        assert not db.conn.in_transaction
+
+    def test_nested_joins_outer(self, db):
+        with db.transaction():
+            with db.transaction():
+                db.upsert_aircraft("A00001", timestamp=1000.0)
+            assert db.conn.in_transaction
+        assert db.get_aircraft("A00001") is not None
 
 
 class TestWALMode:
-    def test_wal_mode_enabled(self, db):
-        mode = db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+    def test_wal_mode_enabled(self, disk_db):
+        mode = disk_db.conn.execute("PRAGMA journal_mode").fetchone()[0]
         assert mode == "wal"
 
-    def test_foreign_keys_enabled(self, db):
-        fk = db.conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    def test_synchronous_normal(self, disk_db):
+        sync = disk_db.conn.execute("PRAGMA synchronous").fetchone()[0]
+        assert sync == 1  # NORMAL
+
+    def test_temp_store_memory(self, disk_db):
+        assert disk_db.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_page_cache_size(self, disk_db):
+        assert disk_db.conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+    def test_foreign_keys_enabled(self, disk_db):
+        fk = disk_db.conn.execute("PRAGMA foreign_keys").fetchone()[0]
         assert fk == 1
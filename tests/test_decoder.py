@@ -1,6 +1,7 @@
 """Tests for message decoder — callsign, position, velocity, squawk."""
 
 import math
+
 import pytest
 
 from src.decoder import (
@@ -25,37 +26,43 @@ from tests.fixtures.known_frames import (
 )
 
 
+@pytest.fixture(scope="module")
+def parsed():
+    """Every known test frame parsed once; ModeFrame is frozen, so sharing is safe."""
+    hexes = [f[0] for f in IDENTIFICATION_FRAMES + POSITION_FRAMES + VELOCITY_FRAMES]
+    return {h: parse_frame(h) for h in hexes}
+
+
 class TestDecodeIdentification:
     """TC 1-4: Callsign decoding."""
 
-    def test_known_callsigns(self):
-        for hex_str, expected_icao, expected_callsign in IDENTIFICATION_FRAMES:
-            frame = parse_frame(hex_str)
-            msg = decode_identification(frame)
-            assert msg is not None, f"Failed to decode {hex_str}"
-            assert msg.icao == expected_icao
-            assert msg.callsign == expected_callsign
-            assert isinstance(msg, IdentificationMsg)
-
-    def test_callsign_klm1023(self):
-        frame = parse_frame("8D4840D6202CC371C32CE0576098")
+    @pytest.mark.parametrize("hex_str,expected_icao,expected_callsign", IDENTIFICATION_FRAMES)
+    def test_known_callsigns(self, hex_str, expected_icao, expected_callsign, parsed):
+        msg = decode_identification(parsed[hex_str])
+        assert msg is not None, f"Failed to decode {hex_str}"
+        assert msg.icao == expected_icao
+        assert msg.callsign == expected_callsign
+        assert isinstance(msg, IdentificationMsg)
+
+    def test_callsign_klm1023(self, parsed):
+        frame = parsed["8D4840D6202CC371C32CE0576098"]
         msg = decode_identification(frame)
         assert msg.callsign == "KLM1023 "
         assert msg.icao == "4840D6"
 
-    def test_callsign_ezy85mh(self):
-        frame = parse_frame("8D406B902015A678D4D220AA4BDA")
+    def test_callsign_ezy85mh(self, parsed):
+        frame = parsed["8D406B902015A678D4D220AA4BDA"]
         msg = decode_identification(frame)
         assert msg.callsign == "EZY85MH "
 
-    def test_non_identification_returns_none(self):
+    def test_non_identification_returns_none(self, parsed):
         """Position frame should not decode as identification."""
-        frame = parse_frame("8D40621D58C382D690C8AC2863A7")
+        frame = parsed["8D40621D58C382D690C8AC2863A7"]
         msg = decode_identification(frame)
         assert msg is None
 
-    def test_category_extracted(self):
-        frame = parse_frame("8D4840D6202CC371C32CE0576098")
+    def test_category_extracted(self, parsed):
+        frame = parsed["8D4840D6202CC371C32CE0576098"]
         msg = decode_identification(frame)
         assert isinstance(msg.category, int)
 
@@ -63,41 +70,40 @@ class TestDecodeIdentification:
 class TestDecodePosition:
     """TC 9-18: Airborne position with CPR encoding."""
 
-    def test_position_frames_parsed(self):
-        for hex_str, expected_icao, expected_alt, cpr_fmt, cpr_lat, cpr_lon in POSITION_FRAMES:
-            frame = parse_frame(hex_str)
-            msg = decode_position(frame)
-            assert msg is not None, f"Failed to decode position {hex_str}"
-            assert msg.icao == expected_icao
-            assert isinstance(msg, PositionMsg)
+    @pytest.mark.parametrize("hex_str,expected_icao", [f[:2] for f in POSITION_FRAMES])
+    def test_position_frames_parsed(self, hex_str, expected_icao, parsed):
+        msg = decode_position(parsed[hex_str])
+        assert msg is not None, f"Failed to decode position {hex_str}"
+        assert msg.icao == expected_icao
+        assert isinstance(msg, PositionMsg)
 
-    def test_even_frame_cpr_values(self):
+    def test_even_frame_cpr_values(self, parsed):
         """Verify CPR values from even frame test vector."""
         hex_str, _, _, cpr_fmt, expected_lat, expected_lon = POSITION_FRAMES[0]
-        frame = parse_frame(hex_str)
+        frame = parsed[hex_str]
         msg = decode_position(frame)
         assert msg.cpr_odd is False  # Even frame
         assert msg.cpr_lat == expected_lat
         assert msg.cpr_lon == expected_lon
 
-    def test_odd_frame_cpr_values(self):
+    def test_odd_frame_cpr_values(self, parsed):
         """Verify CPR values from odd frame test vector."""
         hex_str, _, _, cpr_fmt, expected_lat, expected_lon = POSITION_FRAMES[1]
-        frame = parse_frame(hex_str)
+        frame = parsed[hex_str]
         msg = decode_position(frame)
         assert msg.cpr_odd is True  # Odd frame
         assert msg.cpr_lat == expected_lat
         assert msg.cpr_lon == expected_lon
 
-    def test_altitude_decoded(self):
+    def test_altitude_decoded(self, parsed):
         """Check altitude extraction from position frames."""
         hex_str, _, expected_alt, _, _, _ = POSITION_FRAMES[0]
-        frame = parse_frame(hex_str)
+        frame = parsed[hex_str]
         msg = decode_position(frame)
         assert msg.altitude_ft == expected_alt
 
-    def test_non_position_returns_none(self):
-        frame = parse_frame("8D4840D6202CC371C32CE0576098")  # TC 4 (identification)
+    def test_non_position_returns_none(self, parsed):
+        frame = parsed["8D4840D6202CC371C32CE0576098"]  # TC 4 (identification)
         msg = decode_position(frame)
         assert msg is None
 
@@ -105,43 +111,42 @@ class TestDecodePosition:
 class TestDecodeVelocity:
     """TC 19: Velocity decoding."""
 
-    def test_velocity_frame_parsed(self):
-        for hex_str, expected_icao, expected_speed, expected_hdg, expected_vrate in VELOCITY_FRAMES:
-            frame = parse_frame(hex_str)
-            msg = decode_velocity(frame)
-            assert msg is not None, f"Failed to decode velocity {hex_str}"
-            assert msg.icao == expected_icao
-            assert isinstance(msg, VelocityMsg)
+    @pytest.mark.parametrize("hex_str,expected_icao", [f[:2] for f in VELOCITY_FRAMES])
+    def test_velocity_frame_parsed(self, hex_str, expected_icao, parsed):
+        msg = decode_velocity(parsed[hex_str])
+        assert msg is not None, f"Failed to decode velocity {hex_str}"
+        assert msg.icao == expected_icao
+        assert isinstance(msg, VelocityMsg)
 
-    def test_ground_speed(self):
+    def test_ground_speed(self, parsed):
         hex_str, _, expected_speed, _, _ = VELOCITY_FRAMES[0]
-        frame = parse_frame(hex_str)
+        frame = parsed[hex_str]
         msg = decode_velocity(frame)
         assert msg.speed_kts is not None
         # Allow some tolerance in speed calculation
         assert abs(msg.speed_kts - expected_speed) < 2.0
 
-    def test_heading(self):
+    def test_heading(self, parsed):
         hex_str, _, _, expected_hdg, _ = VELOCITY_FRAMES[0]
-        frame = parse_frame(hex_str)
+        frame = parsed[hex_str]
         msg = decode_velocity(frame)
         assert msg.heading_deg is not None
         assert abs(msg.heading_deg - expected_hdg) < 1.0
 
-    def test_vertical_rate(self):
+    def test_vertical_rate(self, parsed):
         hex_str, _, _, _, expected_vrate = VELOCITY_FRAMES[0]
-        frame = parse_frame(hex_str)
+        frame = parsed[hex_str]
         msg = decode_velocity(frame)
         assert msg.vertical_rate_fpm is not None
         assert abs(msg.vertical_rate_fpm - expected_vrate) < 128  # 64 fpm resolution
 
-    def test_speed_type_ground(self):
-        frame = parse_frame(VELOCITY_FRAMES[0][0])
+    def test_speed_type_ground(self, parsed):
+        frame = parsed[VELOCITY_FRAMES[0][0]]
         msg = decode_velocity(frame)
         assert msg.speed_type == "ground"
 
-    def test_non_velocity_returns_none(self):
-        frame = parse_frame("8D4840D6202CC371C32CE0576098")  # Identification
+    def test_non_velocity_returns_none(self, parsed):
+        frame = parsed["8D4840D6202CC371C32CE0576098"]  # Identification
         msg = decode_velocity(frame)
         assert msg is None
 
@@ -187,18 +192,18 @@ class TestDecodeSquawk:
 class TestDecodeRouter:
     """The top-level decode() function routes to correct decoder."""
 
-    def test_routes_identification(self):
-        frame = parse_frame("8D4840D6202CC371C32CE0576098")
+    def test_routes_identification(self, parsed):
+        frame = parsed["8D4840D6202CC371C32CE0576098"]
         msg = decode(frame)
         assert isinstance(msg, IdentificationMsg)
 
-    def test_routes_position(self):
-        frame = parse_frame("8D40621D58C382D690C8AC2863A7")
+    def test_routes_position(self, parsed):
+        frame = parsed["8D40621D58C382D690C8AC2863A7"]
         msg = decode(frame)
         assert isinstance(msg, PositionMsg)
 
-    def test_routes_velocity(self):
-        frame = parse_frame("8D485020994409940838175B284F")
+    def test_routes_velocity(self, parsed):
+        frame = parsed["8D485020994409940838175B284F"]
         msg = decode(frame)
         assert isinstance(msg, VelocityMsg)
 
@@ -284,14 +289,19 @@ class TestGillhamAltitude:
 
     def test_gillham_range_check(self):
         """Any returned altitude should be within valid Gillham range."""
-        # Test multiple valid digit combinations
+        # Every A/B digit, each valid C digit (C=0 and C>5 invalid) and every
+        # D digit the 13-bit field can carry (no D1 bit)
+        decoded = 0
         for a in range(8):
             for b in range(8):
-                for c in range(1, 6):  # C=0 and C>5 invalid
-                    code = self._encode_gillham(a, b, c)
-                    alt = _decode_gillham_altitude(code)
-                    if alt is not None:
-                        assert -1200 <= alt <= 126750, f"Out of range: {alt} for A={a} B={b} C={c}"
+                for c in range(1, 6):
+                    for d in range(0, 8, 2):
+                        code = self._encode_gillham(a, b, c, d)
+                        alt = _decode_gillham_altitude(code)
+                        if alt is not None:
+                            decoded += 1
+                            assert -1200 <= alt <= 126750, f"Out of range: {alt} for A={a} B={b} C={c} D={d}"
+        assert decoded
 
     def test_gillham_different_c_values_different_altitudes(self):
         """Different C values with same A/B should produce different 100-ft offsets."""
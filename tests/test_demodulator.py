@@ -132,6 +132,11 @@ class TestIQToMagnitude:
         expected = iq[:, 0] ** 2 + iq[:, 1] ** 2
         np.testing.assert_allclose(mag, expected, rtol=1e-5)
 
+    def test_every_iq_pair_matches_lut(self):
+        i, q = np.meshgrid(np.arange(256), np.arange(256), indexing="ij")
+        raw = np.stack([i.ravel(), q.ravel()], axis=1).astype(np.uint8).ravel()
+        np.testing.assert_array_equal(iq_to_magnitude(raw), _MAG_LUT.ravel())
+
 
 # --- Phase 5: Improved Preamble Detection ---
 
@@ -288,6 +293,16 @@ class TestRecoverBits:
         bits, uncertain = recover_bits(mag, 0, n, track_confidence=True)
         assert uncertain >= 2  # At least bits 2 and 4 are uncertain
 
+    def test_weak_run_carries_last_confident_bit(self):
+        """A run of weak bits repeats the last confident bit; a leading weak bit is 0."""
+        weak = (100.0, 100.0 * (1 - BIT_DELTA_THRESHOLD * 0.5))
+        samples = [weak, (500.0, 10.0), weak, weak, (10.0, 500.0), weak]
+        mag = np.zeros(len(samples) * 2 + 10, dtype=np.float32)
+        mag[:len(samples) * 2] = [v for pair in samples for v in pair]
+        bits, uncertain = recover_bits(mag, 0, len(samples), track_confidence=True)
+        assert bits == [0, 1, 1, 1, 0, 0]
+        assert uncertain == 4
+
     def test_uncertain_count_tracked(self):
         """Uncertain bit count should be reported accurately."""
         n = 8
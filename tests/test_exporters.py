@@ -1,5 +1,7 @@
 """Tests for data exporters — CSV, JSON, KML, GeoJSON."""
 
+import csv
+import io
 import json
 import xml.etree.ElementTree as ET
 
@@ -54,6 +56,10 @@ class TestCSVExport:
         lines = [l for l in result.strip().split("\n") if l]
         assert len(lines) == 4  # Header + 3 positions
 
+    def test_row_values_in_column_order(self, db):
+        rows = list(csv.reader(io.StringIO(export_csv(db))))
+        assert rows[1] == ["A00001", "35.2", "-83.3", "37500", "448.0", "92.0", "", "1001.0", ""]
+
     def test_writes_to_file(self, db, tmp_path):
         path = tmp_path / "out.csv"
         export_csv(db, path=path)
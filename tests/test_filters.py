@@ -18,7 +18,7 @@ from src.filters import (
     EMERGENCY_SQUAWKS,
     _haversine_nm,
 )
-from src.tracker import AircraftState
+from src.tracker import AircraftState, CHANGED_ALT, CHANGED_SQUAWK
 
 
 @pytest.fixture
@@ -202,6 +202,14 @@ class TestMultipleFilters:
         assert event.lon == -83.0
         assert event.altitude_ft == 10000
 
+    def test_changed_mask_skips_unaffected_filters(self, engine):
+        """An altitude-only update does not run the squawk filter."""
+        ac = _make_ac(squawk="7700", altitude_ft=300)
+        types = {e.event_type for e in engine.check(ac, CHANGED_ALT)}
+        assert types == {EVENT_LOW_ALTITUDE}
+        types = {e.event_type for e in engine.check(ac, CHANGED_SQUAWK)}
+        assert types == {EVENT_EMERGENCY}
+
 
 class TestCirclingFilter:
     def test_full_circle_detected(self, engine):
@@ -3,7 +3,9 @@
 import time
 import pytest
 
-from src.tracker import Tracker, AircraftState, STALE_TIMEOUT
+from src.tracker import (
+    Tracker, AircraftState, CHANGED_ALL, CHANGED_VEL, MAX_HISTORY, STALE_TIMEOUT,
+)
 from src.database import Database
 from src.frame_parser import parse_frame
 from src.decoder import IdentificationMsg, PositionMsg, VelocityMsg
@@ -55,6 +57,13 @@ class TestTrackerBasic:
         assert ac.heading_deg is not None
         assert ac.vertical_rate_fpm is not None
 
+    def test_last_changed_mask(self, tracker):
+        hex_str = VELOCITY_FRAMES[0][0]
+        tracker.update(parse_frame(hex_str, timestamp=1000.0))
+        assert tracker.last_changed == CHANGED_ALL  # New aircraft
+        tracker.update(parse_frame(hex_str, timestamp=1001.0))
+        assert tracker.last_changed == CHANGED_VEL
+
     def test_position_stores_cpr(self, tracker):
         # Even frame
         hex_even = POSITION_FRAMES[0][0]
@@ -193,6 +202,14 @@ class TestDatabaseIntegration:
         ac = db_tracker.db.get_aircraft(IDENTIFICATION_FRAMES[0][1])
         assert ac is not None
 
+    def test_last_seen_deferred_until_flush(self, db_tracker):
+        hex_str, icao_addr = IDENTIFICATION_FRAMES[0][0], IDENTIFICATION_FRAMES[0][1]
+        db_tracker.update(parse_frame(hex_str, timestamp=1000.0))
+        db_tracker.update(parse_frame(hex_str, timestamp=1005.0))
+        assert db_tracker.db.get_aircraft(icao_addr)["last_seen"] == 1000.0
+        db_tracker.flush()
+        assert db_tracker.db.get_aircraft(icao_addr)["last_seen"] == 1005.0
+
     def test_positions_persisted(self, db_tracker):
         hex_even = POSITION_FRAMES[0][0]
         hex_odd = POSITION_FRAMES[1][0]
@@ -289,6 +306,14 @@ class TestIngestDownsampling:
         # Position history should have entries regardless of DB downsampling
         assert len(ac.position_history) >= 2
 
+    def test_history_bounded(self):
+        """History buffers keep only the newest MAX_HISTORY entries."""
+        ac = AircraftState(icao="A00001")
+        for i in range(MAX_HISTORY + 10):
+            ac.position_history.append((float(i), 35.0, -83.0, 10000))
+        assert len(ac.position_history) == MAX_HISTORY
+        assert ac.position_history[0][0] == 10.0
+
 
 class TestMultiAircraft:
     """Tracking multiple aircraft simultaneously."""
@@ -1,6 +1,7 @@
 """Tests for web dashboard — Flask routes and API endpoints."""
 
 import json
+import threading
 import time
 
 import pytest
@@ -29,7 +30,8 @@ def app(tmp_path):
 
     app = create_app(db_path=db_path)
     app.config["TESTING"] = True
-    return app
+    yield app
+    app.extensions["db_pool"].close()
 
 
 @pytest.fixture
@@ -37,7 +39,78 @@ def client(app):
     return app.test_client()
 
 
+class TestDatabasePool:
+    def test_handle_reused_across_request_threads(self, app):
+        """The dev server's thread-per-request model still reuses one handle."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from flask import g
+
+        seen = []
+
+        @app.get("/_pool_probe")
+        def _pool_probe():
+            seen.append(id(g.db))
+            return "ok"
+
+        for _ in range(3):
+            with ThreadPoolExecutor(max_workers=1) as pool:  # Fresh thread each time
+                assert pool.submit(lambda: app.test_client().get("/_pool_probe").status_code).result() == 200
+        assert len(set(seen)) == 1
+
+    def test_overflow_and_shutdown_close_handles(self, app):
+        from src.web.app import DatabasePool
+
+        pool = DatabasePool(app.config["DB_PATH"], size=1)
+        first, second = pool.acquire(), pool.acquire()
+        _ = first.conn, second.conn
+        pool.release(first)
+        pool.release(second)  # Pool full: closed, not kept
+        assert second._conn is None
+        assert first._conn is not None
+        pool.close()
+        assert first._conn is None
+
+
 class TestAPIAircraft:
+    def test_aircraft_etag(self, app, client):
+        resp = client.get("/api/aircraft")
+        assert resp.headers["Cache-Control"] == "max-age=1"
+        etag = resp.headers["ETag"]
+        assert client.get("/api/aircraft", headers={"If-None-Match": etag}).status_code == 304
+
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00001", timestamp=_NOW + 5)
+        db.close()
+        assert client.get("/api/aircraft", headers={"If-None-Match": etag}).status_code == 200
+
+    @pytest.mark.parametrize("suffix", [":gzip", ":br"])
+    def test_aircraft_etag_matches_compressed_form(self, client, suffix):
+        """flask-compress's "<etag>:gzip" rewrite of a strong ETag still yields a 304."""
+        resp = client.get("/api/aircraft")
+        etag = resp.headers["ETag"]
+        assert etag.startswith('W/"')  # Weak, so flask-compress leaves it alone
+        compressed = f'"{etag[3:-1]}{suffix}"'
+        assert client.get("/api/aircraft", headers={"If-None-Match": compressed}).status_code == 304
+
+    def test_aircraft_etag_moves_on_lagging_upsert(self, app, client):
+        """A write older than MAX(last_seen) still invalidates the ETag."""
+        etag = client.get("/api/aircraft").headers["ETag"]
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00001", registration="N99999", timestamp=_NOW - 600)
+        db.close()
+        resp = client.get("/api/aircraft", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        regs = {a["icao"]: a["registration"] for a in resp.get_json()["aircraft"]}
+        assert regs["A00001"] == "N99999"
+
+    def test_aircraft_etag_stable_on_noop_upsert(self, app, client):
+        etag = client.get("/api/aircraft").headers["ETag"]
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00001", timestamp=_NOW - 600)  # Changes no column
+        db.close()
+        assert client.get("/api/aircraft", headers={"If-None-Match": etag}).status_code == 304
+
     def test_list_aircraft(self, client):
         resp = client.get("/api/aircraft")
         assert resp.status_code == 200
@@ -84,6 +157,96 @@ class TestAPIPositions:
         assert "registration" in pos
         assert "country" in pos
 
+    def test_latest_position_per_aircraft(self, client):
+        data = client.get("/api/positions?minutes=5").get_json()
+        assert data["count"] == 1
+        assert data["positions"][0]["icao"] == "A00001"
+        assert data["positions"][0]["altitude_ft"] == 37500
+
+    def test_live_tracker_etag(self, tmp_path):
+        from src.frame_parser import parse_frame
+        from src.tracker import Tracker
+        from tests.fixtures.known_frames import IDENTIFICATION_FRAMES
+
+        tracker = Tracker()
+        live = create_app(db_path=str(tmp_path / "live.db"), tracker=tracker).test_client()
+        etag = live.get("/api/positions").headers["ETag"]
+        assert live.get("/api/positions", headers={"If-None-Match": etag}).status_code == 304
+        tracker.update(parse_frame(IDENTIFICATION_FRAMES[0][0], timestamp=_NOW))
+        assert live.get("/api/positions", headers={"If-None-Match": etag}).status_code == 200
+        create_app(db_path=str(tmp_path / "live.db"))  # Detach the live tracker again
+
+    def test_live_payload_shared_between_polls(self, tmp_path):
+        from src.frame_parser import parse_frame
+        from src.tracker import Tracker
+        from tests.fixtures.known_frames import POSITION_FRAMES
+
+        tracker = Tracker()
+        live = create_app(db_path=str(tmp_path / "live.db"), tracker=tracker).test_client()
+        for i, frame in enumerate(POSITION_FRAMES):
+            tracker.update(parse_frame(frame[0], timestamp=_NOW + i))
+        first = live.get("/api/positions")
+        cached = live.application.extensions["live_positions_payload"]
+        assert cached[0] is tracker
+        assert cached[1] == first.headers["ETag"].strip('W/"')
+        assert live.get("/api/positions").data == first.data == cached[2]
+        create_app(db_path=str(tmp_path / "live.db"))  # Detach the live tracker again
+
+    def test_live_payload_not_shared_between_apps(self, tmp_path):
+        """Two apps whose trackers reach the same frame count build their own bodies."""
+        from src.frame_parser import parse_frame
+        from src.tracker import Tracker
+        from tests.fixtures.known_frames import IDENTIFICATION_FRAMES, POSITION_FRAMES
+
+        def live_client(frames):
+            tracker = Tracker()
+            client = create_app(db_path=str(tmp_path / "live.db"), tracker=tracker).test_client()
+            for i, frame in enumerate(frames):
+                tracker.update(parse_frame(frame[0], timestamp=_NOW + i))
+            return client
+
+        first = live_client(POSITION_FRAMES).get("/api/positions")
+        assert first.get_json()["count"] == 1
+        second = live_client(IDENTIFICATION_FRAMES[:len(POSITION_FRAMES)]).get("/api/positions")
+        assert second.headers["ETag"] == first.headers["ETag"]  # Same frame count
+        assert second.get_json()["count"] == 0
+        create_app(db_path=str(tmp_path / "live.db"))  # Detach the live tracker again
+
+    def test_positions_cached_between_polls(self, app, client):
+        from src.web import routes
+        routes._positions_cache.clear()
+        first = client.get("/api/positions")
+        assert len(routes._positions_cache) == 1
+        again = client.get("/api/positions")
+        assert again.data == first.data
+        assert again.headers["ETag"] == first.headers["ETag"]
+
+    def test_positions_cache_survives_concurrent_polls(self, app):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.web import routes
+        routes._positions_cache.clear()
+
+        def poll(_):
+            with app.test_client() as c:
+                return c.get("/api/positions").status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert set(pool.map(poll, range(64))) == {200}
+        assert len(routes._positions_cache) <= 1
+
+    def test_positions_etag_moves_on_new_position(self, app, client):
+        resp = client.get("/api/positions")
+        etag = resp.headers["ETag"]
+        assert client.get("/api/positions", headers={"If-None-Match": etag}).status_code == 304
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00002", timestamp=_NOW)
+        db.add_position("A00002", lat=35.0, lon=-83.0, timestamp=_NOW)
+        db.close()
+        fresh = client.get("/api/positions", headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.get_json()["count"] == resp.get_json()["count"] + 1
+
 
 class TestAPIEvents:
     def test_list_events(self, client):
@@ -97,6 +260,19 @@ class TestAPIEvents:
         data = resp.get_json()
         assert data["count"] == 1
 
+    def test_etag_not_modified(self, app, client):
+        etag = client.get("/api/events").headers["ETag"]
+        resp = client.get("/api/events", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+        db = Database(app.config["DB_PATH"])
+        db.add_event("A00001", "emergency_squawk", "7700", timestamp=_NOW)
+        db.close()
+        resp = client.get("/api/events", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
 
 class TestAPIStats:
     def test_stats(self, client):
@@ -107,6 +283,16 @@ class TestAPIStats:
         assert data["positions"] == 2
         assert data["receivers"] == 1
 
+    def test_stats_cached_between_polls(self, app, client):
+        from src.web import routes
+        assert client.get("/api/stats").get_json()["aircraft"] == 2
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00002", timestamp=_NOW)
+        db.close()
+        assert client.get("/api/stats").get_json()["aircraft"] == 2
+        routes._response_cache.clear()
+        assert client.get("/api/stats").get_json()["aircraft"] == 3
+
 
 class TestPageRoutes:
     def test_map_page(self, client):
@@ -119,12 +305,41 @@ class TestPageRoutes:
         assert resp.status_code == 200
         assert b"A00001" in resp.data
 
+    def test_table_page_cache_sees_new_aircraft(self, app, client):
+        assert b"A00003" not in client.get("/table").data
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00003", timestamp=_NOW)
+        db.close()
+        assert b"A00003" in client.get("/table").data
+
+    def test_table_page_concurrent_renders(self, app):
+        from concurrent.futures import ThreadPoolExecutor
+
+        def render(_):
+            with app.test_client() as c:
+                return c.get("/table").status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert set(pool.map(render, range(32))) == {200}
+
     def test_aircraft_detail_page(self, client):
         resp = client.get("/aircraft/A00001")
         assert resp.status_code == 200
         assert b"A00001" in resp.data
         assert b"United States" in resp.data
 
+    def test_aircraft_detail_shows_latest_sighting(self, app, client):
+        db = Database(app.config["DB_PATH"])
+        db.upsert_sighting("A00001", capture_id=1, callsign="OLD123", timestamp=_NOW)
+        capture_id = db.start_capture(source="second")
+        db.upsert_sighting("A00001", capture_id=capture_id, callsign="DAL456",
+                           squawk="7000", timestamp=_NOW)
+        db.close()
+        resp = client.get("/aircraft/A00001")
+        assert b"DAL456" in resp.data
+        assert b"OLD123" not in resp.data
+        assert b"7000" in resp.data
+
     def test_aircraft_detail_not_found(self, client):
         resp = client.get("/aircraft/FFFFFF")
         assert resp.status_code == 404
@@ -161,6 +376,37 @@ class TestAPITrails:
         assert trail[0][2] == 38000
         assert trail[1][2] == 37500
 
+    def test_trails_limit_applies_per_aircraft(self, app, client):
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00002", timestamp=_NOW)
+        for i in range(3):
+            db.add_position("A00002", lat=36.0, lon=-84.0, altitude_ft=1000 * i, timestamp=_NOW - 30 + i)
+        db.close()
+        trails = client.get("/api/trails?limit=2").get_json()["trails"]
+        assert len(trails["A00001"]) == 2
+        assert [p[2] for p in trails["A00002"]] == [0, 1000]
+
+    def test_trails_served_from_response_cache(self, app, client):
+        from src.web import routes
+        first = client.get("/api/trails")
+        etag = first.headers["ETag"]
+        assert client.get("/api/trails", headers={"If-None-Match": etag}).status_code == 304
+        db = Database(app.config["DB_PATH"])
+        db.upsert_aircraft("A00002", timestamp=_NOW)
+        db.add_position("A00002", lat=36.0, lon=-84.0, timestamp=_NOW)
+        db.close()
+        assert client.get("/api/trails").data == first.data
+        routes._response_cache.clear()
+        assert "A00002" in client.get("/api/trails").get_json()["trails"]
+
+    def test_trails_query_range_scans_timestamp(self):
+        from src.web import routes
+        db = Database(":memory:")
+        plan = db.conn.execute("EXPLAIN QUERY PLAN " + routes._SQL_TRAILS, (_NOW, 10)).fetchall()
+        detail = " ".join(row["detail"] for row in plan)
+        assert "idx_positions_timestamp (timestamp>?)" in detail
+        db.close()
+
     def test_trails_narrow_window_excludes_data(self, client):
         """A very short minutes window (1 min) should still include recent data."""
         resp = client.get("/api/trails?minutes=1")
@@ -195,6 +441,16 @@ class TestAirports:
         assert "lat" in apt
         assert "lon" in apt
 
+    def test_airports_etag(self, client):
+        resp = client.get("/api/airports")
+        assert "max-age=86400" in resp.headers["Cache-Control"]
+        again = client.get("/api/airports", headers={"If-None-Match": resp.headers["ETag"]})
+        assert again.status_code == 304
+        assert again.data == b""
+        tag = resp.headers["ETag"][3:-1]
+        gz = client.get("/api/airports", headers={"If-None-Match": f'"{tag}:gzip"'})
+        assert gz.status_code == 304
+
 
 class TestAllPositions:
     def test_all_positions(self, client):
@@ -211,6 +467,61 @@ class TestAllPositions:
         data = resp.get_json()
         assert data["count"] == 1
 
+    def test_all_positions_one_row_per_position(self, app, client):
+        db = Database(app.config["DB_PATH"])
+        db.upsert_sighting("A00001", capture_id=1, callsign="OLD123", timestamp=_NOW - 60)
+        capture_id = db.start_capture(source="second")
+        db.upsert_sighting("A00001", capture_id=capture_id, callsign="DAL456", timestamp=_NOW)
+        db.close()
+        data = client.get("/api/positions/all").get_json()
+        assert data["count"] == 2
+        assert {p["callsign"] for p in data["positions"]} == {"DAL456"}
+
+    @pytest.mark.parametrize("path", ["/api/positions/all", "/api/query"])
+    def test_columnar_matches_row_form_exactly(self, app, client, path):
+        db = Database(app.config["DB_PATH"])
+        db.add_position("ADF7C8", lat=35.123456789, lon=-83.987654321, altitude_ft=None,
+                        speed_kts=431.25, vertical_rate_fpm=-1088, timestamp=_NOW + 2)
+        db.close()
+        rows = client.get(path).get_json()["positions"]
+        data = client.get(f"{path}?format=columns").get_json()
+        assert data["count"] == len(rows) == 3
+        columns = data["columns"]
+        assert [dict(zip(columns, values)) for values in zip(*columns.values())] == rows
+        assert all(isinstance(v, int) for v in columns["altitude_ft"] if v is not None)
+        assert None in columns["altitude_ft"]
+
+    def test_all_positions_streams_across_chunks(self, app, client):
+        db = Database(app.config["DB_PATH"], autocommit=False)
+        for i in range(1200):
+            db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=_NOW + 10 + i)
+        db.close()
+        resp = client.get("/api/positions/all?limit=1202")
+        assert resp.is_streamed
+        data = resp.get_json()
+        assert data["count"] == len(data["positions"]) == 1202
+
+    def test_all_positions_keyset_pages(self, app, client):
+        db = Database(app.config["DB_PATH"])
+        for _ in range(3):
+            db.add_position("A00001", lat=35.0, lon=-83.0, timestamp=_NOW + 5)
+        db.close()
+        everything = client.get("/api/positions/all").get_json()["positions"]
+        seen, cursor = [], ""
+        while True:
+            page = client.get(f"/api/positions/all?limit=2{cursor}").get_json()["positions"]
+            seen += page
+            if len(page) < 2:
+                break
+            cursor = f"&after={page[-1]['timestamp']}&after_id={page[-1]['id']}"
+        assert [p["id"] for p in seen] == [p["id"] for p in everything]
+        assert len(seen) == 5
+
+    def test_all_positions_after_without_id(self, client):
+        rows = client.get("/api/positions/all").get_json()["positions"]
+        data = client.get(f"/api/positions/all?after={rows[0]['timestamp']}").get_json()
+        assert all(p["timestamp"] > rows[0]["timestamp"] for p in data["positions"])
+
 
 class TestEventsPage:
     def test_events_page(self, client):
@@ -266,11 +577,45 @@ class TestQueryAPI:
         data = resp.get_json()
         assert data["count"] == 1
 
+    def test_query_args_parsed_once(self):
+        from werkzeug.datastructures import MultiDict
+
+        from src.web.routes import _parse_query_args
+        q = _parse_query_args(MultiDict({"icao": "a00001", "military": "0", "limit": "99999"}))
+        assert (q.icao, q.military, q.limit, q.min_alt, q.columnar) == ("A00001", False, 50000, None, False)
+        assert _parse_query_args(MultiDict({"military": "yes"})).military is None
+
+    def test_query_sql_cached_per_filter_combination(self, client):
+        from src.web.routes import _query_sql
+        client.get("/api/query?min_alt=1000&military=1")
+        client.get("/api/query?min_alt=5000&military=1")
+        sql = _query_sql(True, False, False, True)
+        assert sql is _query_sql(True, False, False, True)
+        assert "altitude_ft >= ?" in sql and "is_military = 1" in sql
+        assert "p.icao" not in sql.split("WHERE")[1]
+
+    def test_query_columnar(self, client):
+        data = client.get("/api/query?min_alt=38000&format=columns").get_json()
+        assert data["count"] == 1
+        assert data["columns"]["icao"] == ["A00001"]
+        assert data["columns"]["altitude_ft"] == [38000]
+        assert data["columns"]["is_military"] == [False]
+
     def test_query_page(self, client):
         resp = client.get("/query")
         assert resp.status_code == 200
         assert b"Query" in resp.data
 
+    @pytest.mark.parametrize("page", ["/query", "/replay"])
+    def test_pages_share_columns_helper(self, client, page):
+        html = client.get(page).data
+        assert b"/static/columns.js" in html
+        assert b"function fromColumns" not in html
+        js = client.get("/static/columns.js")
+        assert js.status_code == 200
+        assert b"function fromColumns" in js.data
+        js.close()
+
 
 class TestHeatmap:
     def test_heatmap_endpoint(self, client):
@@ -288,6 +633,36 @@ class TestHeatmap:
             point = data["points"][0]
             assert len(point) == 3  # [lat, lon, altitude_ft]
 
+    def test_heatmap_samples_whole_window(self, app, client, monkeypatch):
+        from src.web import routes
+        monkeypatch.setattr(routes, "_HEATMAP_MAX_POINTS", 5)
+        db = Database(app.config["DB_PATH"], autocommit=False)
+        for i in range(18):
+            db.add_position("A00001", lat=10.0 + i, lon=-83.0, timestamp=_NOW - 600 + i)
+        db.close()
+        data = client.get("/api/heatmap").get_json()
+        assert 0 < data["count"] <= 5
+        lats = [p[0] for p in data["points"]]
+        assert min(lats) < 15 and max(lats) > 20
+
+    def test_heatmap_keeps_interleaved_aircraft(self, app, client, monkeypatch):
+        from src.web import routes
+        # 302 rows / 26 points -> stride 12, a multiple of the six aircraft
+        # reporting round-robin, which id % stride sampling reduced to one.
+        monkeypatch.setattr(routes, "_HEATMAP_MAX_POINTS", 26)
+        db = Database(app.config["DB_PATH"], autocommit=False)
+        for k in range(6):
+            db.upsert_aircraft(f"A1000{k}", timestamp=_NOW)
+        for tick in range(50):
+            for k in range(6):
+                db.add_position(f"A1000{k}", lat=50.0 + k, lon=-83.0,
+                                timestamp=_NOW - 600 + tick)
+        db.close()
+        data = client.get("/api/heatmap").get_json()
+        assert 0 < data["count"] <= 26
+        seen = {p[0] for p in data["points"]}
+        assert {50.0 + k for k in range(6)} <= seen
+
     def test_heatmap_minutes_param(self, client):
         resp = client.get("/api/heatmap?minutes=5")
         assert resp.status_code == 200
@@ -365,7 +740,144 @@ class TestGeofences:
         assert resp.status_code == 400
 
 
+class TestRouteRegistration:
+    def test_each_endpoint_registered_once(self, app):
+        seen = set()
+        for rule in app.url_map.iter_rules():
+            for method in rule.methods - {"HEAD", "OPTIONS"}:
+                assert (rule.rule, method) not in seen
+                seen.add((rule.rule, method))
+
+
 class TestCORS:
     def test_cors_header(self, client):
         resp = client.get("/api/stats")
         assert resp.headers.get("Access-Control-Allow-Origin") == "*"
+
+
+class TestLookupCache:
+    @pytest.fixture(autouse=True)
+    def _offline(self, monkeypatch):
+        from src.web import routes
+
+        routes._lookup_cache.clear()
+        self.calls = []
+
+        def fail(url):
+            self.calls.append(url)
+            raise OSError("offline")
+
+        monkeypatch.setattr(routes, "_http_get_json", fail)
+        yield
+        routes._lookup_cache.clear()
+
+    def test_failed_lookup_cached(self, client):
+        first = client.get("/api/lookup/abc123").get_json()
+        second = client.get("/api/lookup/ABC123").get_json()
+        assert first["error"] == second["error"] == "Lookup failed"
+        assert len(self.calls) == 1
+
+    def test_concurrent_lookups_share_one_call(self, app, monkeypatch):
+        from src.web import routes
+
+        started = threading.Event()
+
+        def slow_fail(url):
+            self.calls.append(url)
+            started.set()
+            time.sleep(0.2)
+            raise OSError("offline")
+
+        monkeypatch.setattr(routes, "_http_get_json", slow_fail)
+        results = []
+
+        def fetch():
+            results.append(app.test_client().get("/api/lookup/ABC123").get_json())
+
+        first = threading.Thread(target=fetch)
+        first.start()
+        started.wait(1)
+        others = [threading.Thread(target=fetch) for _ in range(4)]
+        for t in others:
+            t.start()
+        for t in [first, *others]:
+            t.join()
+        assert len(results) == 5
+        assert len(self.calls) == 1
+
+    def test_lookup_result_schema(self, client, monkeypatch):
+        from src.web import routes
+
+        monkeypatch.setattr(routes, "_http_get_json", lambda url: {
+            "Registration": "N12345", "Manufacturer": "Boeing", "ICAOTypeCode": "B738",
+        })
+        data = client.get("/api/lookup/a00001").get_json()
+        assert data["icao"] == "A00001"
+        assert data["registration"] == "N12345"
+        assert data["type_code"] == "B738"
+        assert "error" not in data
+
+    def test_cache_bounded(self, client, monkeypatch):
+        from src.web import routes
+
+        monkeypatch.setattr(routes, "_LOOKUP_CACHE_MAX", 2)
+        for icao in ("A00001", "A00002", "A00003"):
+            client.get(f"/api/lookup/{icao}")
+        assert list(routes._lookup_cache) == ["A00002", "A00003"]
+
+    def test_expired_entry_refetched_and_dropped(self, client, monkeypatch):
+        from src.web import routes
+
+        monkeypatch.setattr(routes, "_LOOKUP_NEGATIVE_TTL", 0)
+        client.get("/api/lookup/A00001")
+        assert routes._lookup_cache_get("A00001") is None
+        assert "A00001" not in routes._lookup_cache
+        client.get("/api/lookup/A00001")
+        assert len(self.calls) == 2
+
+
+class TestJSONProvider:
+    def test_orjson_provider_installed(self, app):
+        pytest.importorskip("orjson")
+        from src.web.json_provider import OrjsonProvider
+        assert isinstance(app.json, OrjsonProvider)
+
+    def test_response_round_trips(self, client):
+        resp = client.get("/api/aircraft")
+        assert resp.mimetype == "application/json"
+        assert json.loads(resp.data)["count"] == 2
+
+    def test_numpy_and_int_keys(self, app):
+        pytest.importorskip("orjson")
+        import numpy as np
+        with app.app_context():
+            body = app.json.dumps({1: np.float32(2.5), "arr": np.arange(3), "nan": float("nan")})
+        assert json.loads(body) == {"1": 2.5, "arr": [0, 1, 2], "nan": None}
+
+    def test_compact_output_in_debug(self, app):
+        app.debug = True
+        with app.app_context():
+            assert app.json.dumps({"b": 1, "a": [1, 2]}) == '{"b":1,"a":[1,2]}'
+
+    def test_request_body_parsed(self, client):
+        resp = client.post("/api/geofences", data=b"{not json", content_type="application/json")
+        assert resp.status_code == 400
+
+
+class TestConnectionReuse:
+    def test_db_reused_across_requests(self, app):
+        from flask import g
+
+        seen = []
+
+        @app.after_request
+        def _grab(resp):
+            seen.append(g.db)
+            return resp
+
+        client = app.test_client()
+        client.get("/api/stats")
+        client.get("/api/aircraft")
+        assert len(seen) == 2
+        assert seen[0] is seen[1]
+        assert seen[0]._conn is not None  # Not closed at teardown